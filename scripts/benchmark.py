@@ -1,7 +1,8 @@
 # Benchmarking script for PlayWise engine performance
 
-import time
+import argparse
 import random
+from concurrent.futures import ProcessPoolExecutor
 from src.core.playlist_engine import PlaylistEngine
 from src.core.playback_history import PlaybackHistory
 from src.core.song_rating_tree import SongRatingTree
@@ -10,58 +11,104 @@ from src.core.playlist_sorter import PlaylistSorter
 from src.core.auto_cleaner import AutoCleaner
 from src.core.favorites_queue import FavoritesQueue
 from src.core.system_snapshot import SystemSnapshot
+from src.models.song import Song
+from timing import bench
 
 def benchmark_playlist_engine():
-    print("Benchmarking Playlist Engine...")
-    playlist = PlaylistEngine()
-    
-    # Add songs
-    start_time = time.time()
-    for i in range(1000):
-        playlist.add_song(f"Song {i}", position=-1)
-    print(f"Time to add 1000 songs: {time.time() - start_time:.4f} seconds")
-
-    # Delete songs
-    start_time = time.time()
-    for i in range(500):
-        playlist.delete_song(0)  # Always delete the first song
-    print(f"Time to delete 500 songs: {time.time() - start_time:.4f} seconds")
+    songs = [Song(f"Song {i}", "Artist", 200) for i in range(1000)]
+
+    def new_playlist():
+        playlist = PlaylistEngine()
+        playlist.create_playlist("Benchmark")
+        return playlist
+
+    def full_playlist():
+        playlist = new_playlist()
+        for song in songs:
+            playlist.append_song(song)
+        return playlist
+
+    def add_songs(playlist):
+        for song in songs:
+            playlist.append_song(song)
+
+    # Every deletion from the head shifts the remaining songs
+    def delete_from_head(playlist):
+        for i in range(500):
+            playlist.delete_song(0)
+
+    # Deleting from the tail needs no shifting
+    def delete_from_tail(playlist):
+        for i in range(999, 499, -1):
+            playlist.delete_song(i)
+
+    bench("playlist_engine.add_1000", add_songs, setup=new_playlist)
+    bench("playlist_engine.delete_500_head", delete_from_head, setup=full_playlist)
+    bench("playlist_engine.delete_500_tail", delete_from_tail, setup=full_playlist)
 
 def benchmark_playback_history():
-    print("Benchmarking Playback History...")
-    history = PlaybackHistory()
-    
-    # Add to history
-    start_time = time.time()
-    for i in range(100):
-        history.add_to_history(f"Song {i}")
-    print(f"Time to add 100 songs to history: {time.time() - start_time:.4f} seconds")
-
-    # Undo last play
-    start_time = time.time()
-    for _ in range(50):
-        history.undo_last_play()
-    print(f"Time to undo 50 plays: {time.time() - start_time:.4f} seconds")
+    songs = [Song(f"Song {i}", f"Artist {i}", 200) for i in range(100)]
+
+    def full_history():
+        history = PlaybackHistory()
+        for song in songs:
+            history.add_to_history(song)
+        return history
+
+    def add_to_history(history):
+        for song in songs:
+            history.add_to_history(song)
+
+    def undo_plays(history):
+        for _ in range(50):
+            history.undo_last_play()
+
+    bench("playback_history.add_100", add_to_history, setup=PlaybackHistory)
+    bench("playback_history.undo_50", undo_plays, setup=full_history)
 
 def benchmark_song_rating_tree():
-    print("Benchmarking Song Rating Tree...")
-    rating_tree = SongRatingTree()
-    
-    # Insert songs
-    start_time = time.time()
-    for i in range(1000):
-        rating_tree.insert_song(f"Song {i}", random.randint(1, 5))
-    print(f"Time to insert 1000 songs: {time.time() - start_time:.4f} seconds")
-
-    # Search by rating
-    start_time = time.time()
-    rating_tree.search_by_rating(random.randint(1, 5))
-    print(f"Time to search by rating: {time.time() - start_time:.4f} seconds")
+    # Inputs are generated up front so the timings exclude the RNG
+    ratings = random.choices(range(1, 6), k=1000)
+    songs = [Song(f"Song {i}", "Artist", 180, rating) for i, rating in enumerate(ratings)]
+    search_rating = random.randint(1, 5)
+
+    def full_tree():
+        rating_tree = SongRatingTree()
+        for song in songs:
+            rating_tree.insert_song(song)
+        return rating_tree
+
+    def insert_songs(rating_tree):
+        for song in songs:
+            rating_tree.insert_song(song)
+
+    def search(rating_tree):
+        rating_tree.search_by_rating(search_rating)
+
+    bench("song_rating_tree.insert_1000", insert_songs, setup=SongRatingTree)
+    bench("song_rating_tree.search_by_rating", search, setup=full_tree)
+
+BENCHMARKS = [benchmark_playlist_engine, benchmark_playback_history, benchmark_song_rating_tree]
+
+def _run(benchmark):
+    benchmark()
 
 def main():
-    benchmark_playlist_engine()
-    benchmark_playback_history()
-    benchmark_song_rating_tree()
+    parser = argparse.ArgumentParser(description="PlayWise engine benchmarks")
+    parser.add_argument(
+        "--serial",
+        action="store_true",
+        help="Run benchmarks one after another instead of in parallel processes"
+    )
+    args = parser.parse_args()
+
+    if args.serial:
+        for benchmark in BENCHMARKS:
+            benchmark()
+    else:
+        # Each benchmark builds its own structures, so they can run on separate cores
+        with ProcessPoolExecutor(max_workers=len(BENCHMARKS)) as executor:
+            list(executor.map(_run, BENCHMARKS))
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
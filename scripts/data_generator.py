@@ -1,33 +1,50 @@
 # Sample data generator for PlayWise music playlist management engine
 
+import os
 import random
 import string
 
+ALPHABET = (string.ascii_letters + string.digits).encode('ascii')
+
+# Maps every byte value onto the alphabet so random bytes can be turned into
+# characters with a single bytes.translate call
+_BYTE_TO_CHAR = bytes(ALPHABET[i % len(ALPHABET)] for i in range(256))
+
+def _random_chars(length):
+    """Generate `length` random alphanumeric characters."""
+    return os.urandom(length).translate(_BYTE_TO_CHAR).decode('ascii')
+
 def generate_random_song_title(length=10):
     """Generate a random song title."""
-    return ''.join(random.choices(string.ascii_letters + string.digits, k=length))
+    return _random_chars(length)
 
 def generate_random_artist_name(length=8):
     """Generate a random artist name."""
-    return ''.join(random.choices(string.ascii_letters + string.digits, k=length))
+    return _random_chars(length)
+
+def _generate_random_strings(count, length):
+    """Generate `count` random strings of `length` characters from a single draw."""
+    chars = _random_chars(count * length)
+    return [chars[i:i + length] for i in range(0, count * length, length)]
 
 def generate_sample_songs(num_songs=100):
     """Generate a list of sample songs."""
-    songs = []
-    for _ in range(num_songs):
-        title = generate_random_song_title()
-        artist = generate_random_artist_name()
-        duration = random.randint(180, 300)  # Duration in seconds
-        rating = random.randint(1, 5)  # Rating from 1 to 5
-        songs.append({
+    titles = _generate_random_strings(num_songs, 10)
+    artists = _generate_random_strings(num_songs, 8)
+    randint = random.randint
+    durations = [randint(180, 300) for _ in range(num_songs)]  # Duration in seconds
+    ratings = [randint(1, 5) for _ in range(num_songs)]  # Rating from 1 to 5
+    return [
+        {
             'title': title,
             'artist': artist,
             'duration': duration,
             'rating': rating
-        })
-    return songs
+        }
+        for title, artist, duration, rating in zip(titles, artists, durations, ratings)
+    ]
 
 if __name__ == "__main__":
     sample_songs = generate_sample_songs(100)
     for song in sample_songs:
-        print(song)
\ No newline at end of file
+        print(song)
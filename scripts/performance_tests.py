@@ -1,45 +1,55 @@
 # Performance Tests for PlayWise Engine
 
-import time
 import random
 from src.core.playlist_engine import PlaylistEngine
 from src.models.song import Song
+from timing import bench
 
-def generate_random_songs(num_songs):
+ARTIST_NAMES = [f"Artist {k}" for k in range(1, 11)]
+
+def generate_random_songs(num_songs, seed=0):
     """Generate a list of random songs."""
-    songs = []
-    for i in range(num_songs):
-        song = Song(title=f"Song {i}", artist=f"Artist {random.randint(1, 10)}", duration=random.randint(180, 300), rating=random.randint(1, 5))
-        songs.append(song)
-    return songs
+    rng = random.Random(seed)
+    artists = rng.choices(ARTIST_NAMES, k=num_songs)
+    durations = rng.choices(range(180, 301), k=num_songs)
+    ratings = rng.choices(range(1, 6), k=num_songs)
+    titles = [f"Song {i}" for i in range(num_songs)]
+    return Song.bulk_create(titles, artists, durations, ratings)
 
 def performance_test_playlist_engine():
     """Test the performance of the PlaylistEngine."""
-    print("Starting performance tests for PlaylistEngine...")
-    
-    playlist = PlaylistEngine()
     num_songs = 1000
     songs = generate_random_songs(num_songs)
 
-    # Measure time to add songs
-    start_time = time.time()
-    for song in songs:
-        playlist.add_song(song)
-    end_time = time.time()
-    print(f"Time to add {num_songs} songs: {end_time - start_time:.4f} seconds")
-
-    # Measure time to delete songs
-    start_time = time.time()
-    for i in range(num_songs // 2):  # Delete half of the songs
-        playlist.delete_song(0)  # Always delete the first song
-    end_time = time.time()
-    print(f"Time to delete {num_songs // 2} songs: {end_time - start_time:.4f} seconds")
-
-    # Measure time to reorder songs
-    start_time = time.time()
-    playlist.reverse_playlist()
-    end_time = time.time()
-    print(f"Time to reverse playlist: {end_time - start_time:.4f} seconds")
+    def new_playlist():
+        playlist = PlaylistEngine()
+        playlist.create_playlist("Performance Test")
+        return playlist
+
+    def full_playlist():
+        playlist = new_playlist()
+        for song in songs:
+            playlist.append_song(song)
+        return playlist
+
+    def add_songs(playlist):
+        for song in songs:
+            playlist.append_song(song)
+
+    # Each deletion from the head shifts the rest of the playlist
+    def delete_from_head(playlist):
+        for i in range(num_songs // 2):  # Delete half of the songs
+            playlist.delete_song(0)
+
+    # Deleting from the tail needs no shifting
+    def delete_from_tail(playlist):
+        for i in range(num_songs - 1, num_songs // 2 - 1, -1):
+            playlist.delete_song(i)
+
+    bench(f"playlist_engine.add_{num_songs}", add_songs, setup=new_playlist)
+    bench(f"playlist_engine.delete_{num_songs // 2}_head", delete_from_head, setup=full_playlist)
+    bench(f"playlist_engine.delete_{num_songs // 2}_tail", delete_from_tail, setup=full_playlist)
+    bench("playlist_engine.reverse", lambda playlist: playlist.reverse_playlist(), setup=full_playlist)
 
 if __name__ == "__main__":
     performance_test_playlist_engine()
\ No newline at end of file
@@ -0,0 +1,39 @@
+# Timing helpers shared by the PlayWise benchmark scripts
+
+import json
+import statistics
+import time
+
+def bench(name, fn, setup=None, warmup=1, iters=5):
+    """
+    Time `fn` with warm-up passes and print the result as a JSON line.
+
+    Args:
+        name: Label for the benchmark
+        fn: Callable to time; receives the return value of `setup` if given
+        setup: Optional callable producing fresh state for each run (not timed)
+        warmup: Number of untimed runs before measuring
+        iters: Number of timed runs
+
+    Returns:
+        dict: min/median/stdev of the timed runs in nanoseconds
+    """
+    for _ in range(warmup):
+        fn(setup()) if setup else fn()
+
+    timings = []
+    for _ in range(iters):
+        state = setup() if setup else None
+        start = time.perf_counter_ns()
+        fn(state) if setup else fn()
+        timings.append(time.perf_counter_ns() - start)
+
+    stats = {
+        'benchmark': name,
+        'iters': iters,
+        'min_ns': min(timings),
+        'median_ns': int(statistics.median(timings)),
+        'stdev_ns': int(statistics.stdev(timings)) if iters > 1 else 0
+    }
+    print(json.dumps(stats))
+    return stats
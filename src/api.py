@@ -5,8 +5,10 @@ Provides REST API endpoints for all engine functionality
 
 from fastapi import FastAPI, HTTPException, Query, Path, Body
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
-from typing import List, Optional, Dict, Any
+from fastapi.responses import JSONResponse, Response
+from typing import Iterable, List, Optional, Dict, Any
+import asyncio
+import os
 import uvicorn
 from datetime import datetime
 
@@ -14,7 +16,8 @@ from playwise_engine import PlayWiseEngine
 from models.schemas import (
     SongCreate, SongUpdate, SongResponse, PlaylistCreate, PlaylistResponse,
     SortRequest, MoveRequest, RatingSearchRequest, SystemStatsResponse,
-    ErrorResponse, SuccessResponse, SortAlgorithm, SortCriteria
+    ErrorResponse, SuccessResponse, SortAlgorithm, SortCriteria,
+    DuplicateStrategy, ExportFormat
 )
 from models.song import Song
 
@@ -27,18 +30,60 @@ app = FastAPI(
     redoc_url="/redoc"
 )
 
+# Allowed CORS origins, comma-separated in PLAYWISE_ORIGINS
+ALLOWED_ORIGINS = tuple(
+    origin.strip()
+    for origin in os.environ.get("PLAYWISE_ORIGINS", "http://localhost:3000").split(",")
+    if origin.strip()
+)
+
 # Add CORS middleware
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],  # In production, specify actual origins
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_origins=ALLOWED_ORIGINS,
+    allow_credentials=False,
+    allow_methods=("GET", "POST", "PUT", "DELETE"),
+    allow_headers=("Content-Type", "Authorization"),
 )
 
 # Initialize the PlayWise engine
 playwise_engine = PlayWiseEngine()
 
+# Second-resolution timestamp shared by informational endpoints, refreshed
+# once per second instead of being formatted on every request
+current_timestamp = datetime.now().isoformat(timespec="seconds")
+_background_tasks = set()
+
+async def _refresh_timestamp():
+    """Keep current_timestamp up to date."""
+    global current_timestamp
+    while True:
+        current_timestamp = datetime.now().isoformat(timespec="seconds")
+        await asyncio.sleep(1)
+
+@app.on_event("startup")
+async def start_timestamp_refresh():
+    task = asyncio.create_task(_refresh_timestamp())
+    _background_tasks.add(task)
+
+def song_list_response(songs: Iterable[Song]) -> JSONResponse:
+    """
+    Serialize songs straight into a JSON response.
+    
+    Returning a Response skips FastAPI's response_model validation, which
+    would otherwise re-validate every field of every song. The
+    response_model on each route is kept for the OpenAPI docs.
+    """
+    return JSONResponse(content=[song.to_dict() for song in songs])
+
+def song_response(song: Song, status_code: int = 200) -> JSONResponse:
+    """Serialize a single song straight into a JSON response."""
+    return JSONResponse(status_code=status_code, content=song.to_dict())
+
+def success_response(message: str) -> JSONResponse:
+    """Build a SuccessResponse body directly, skipping response validation."""
+    return JSONResponse(content={"message": message, "data": None})
+
 # Custom exception handlers
 @app.exception_handler(HTTPException)
 async def http_exception_handler(request, exc):
@@ -57,24 +102,27 @@ async def general_exception_handler(request, exc):
 # Root endpoint
 @app.get("/", response_model=Dict[str, Any])
 async def root():
-    """Root endpoint with API information."""
+    """Root endpoint with API information (timestamp has 1 s resolution)."""
     return {
         "message": "Welcome to PlayWise Music Playlist Management API",
         "version": "1.0.0",
         "docs": "/docs",
         "engine_stats": playwise_engine.get_engine_stats(),
-        "timestamp": datetime.now().isoformat()
+        "timestamp": current_timestamp
     }
 
 # Health check endpoint
+HEALTH_RESPONSE_TEMPLATE = '{"status":"healthy","timestamp":"%s","engine_initialized":"%s"}'
+
 @app.get("/health", response_model=Dict[str, str])
 async def health_check():
-    """Health check endpoint."""
-    return {
-        "status": "healthy",
-        "timestamp": datetime.now().isoformat(),
-        "engine_initialized": str(playwise_engine.initialized)
-    }
+    """Health check endpoint (timestamp has 1 s resolution)."""
+    # Polled constantly by load balancers, so the body is formatted directly
+    # instead of going through response validation and JSON encoding
+    return Response(
+        content=HEALTH_RESPONSE_TEMPLATE % (current_timestamp, playwise_engine.initialized),
+        media_type="application/json"
+    )
 
 # ========== SONG MANAGEMENT ENDPOINTS ==========
 
@@ -88,7 +136,7 @@ async def create_song(song_data: SongCreate):
             duration=song_data.duration,
             rating=song_data.rating
         )
-        return song.to_dict()
+        return song_response(song, status_code=201)
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Failed to create song: {str(e)}")
 
@@ -99,13 +147,9 @@ async def get_all_songs(
 ):
     """Get all songs with pagination."""
     try:
-        all_songs = playwise_engine.song_lookup.get_all_songs()
-        total_songs = len(all_songs)
-        
-        # Apply pagination
-        paginated_songs = all_songs[offset:offset + limit]
+        paginated_songs = playwise_engine.song_lookup.get_all_songs(offset, limit)
         
-        return [song.to_dict() for song in paginated_songs]
+        return song_list_response(paginated_songs)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to retrieve songs: {str(e)}")
 
@@ -115,7 +159,7 @@ async def get_song(song_id: str = Path(..., description="Song ID")):
     song = playwise_engine.song_lookup.get_song(song_id)
     if not song:
         raise HTTPException(status_code=404, detail="Song not found")
-    return song.to_dict()
+    return song_response(song)
 
 @app.put("/songs/{song_id}", response_model=SongResponse)
 async def update_song(
@@ -123,24 +167,11 @@ async def update_song(
     song_update: SongUpdate = Body(...)
 ):
     """Update a song."""
-    song = playwise_engine.song_lookup.get_song(song_id)
+    song = playwise_engine.update_song(song_id, song_update.model_dump(exclude_none=True))
     if not song:
         raise HTTPException(status_code=404, detail="Song not found")
     
-    # Update song fields
-    if song_update.title is not None:
-        song.title = song_update.title
-    if song_update.artist is not None:
-        song.artist = song_update.artist
-    if song_update.duration is not None:
-        song.duration = song_update.duration
-    if song_update.rating is not None:
-        song.update_rating(song_update.rating)
-    
-    # Update in lookup system
-    playwise_engine.song_lookup.update_song(song)
-    
-    return song.to_dict()
+    return song_response(song)
 
 @app.delete("/songs/{song_id}", response_model=SuccessResponse)
 async def delete_song(song_id: str = Path(..., description="Song ID")):
@@ -154,7 +185,7 @@ async def delete_song(song_id: str = Path(..., description="Song ID")):
     playwise_engine.song_rating_tree.delete_song(song_id)
     playwise_engine.favorites_queue.remove_song(song_id)
     
-    return SuccessResponse(message="Song deleted successfully")
+    return success_response("Song deleted successfully")
 
 # ========== SONG SEARCH ENDPOINTS ==========
 
@@ -170,7 +201,7 @@ async def search_songs_by_title(
         else:
             songs = playwise_engine.song_lookup.fuzzy_search_title(query)
         
-        return [song.to_dict() for song in songs]
+        return song_list_response(songs)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Search failed: {str(e)}")
 
@@ -186,7 +217,7 @@ async def search_songs_by_artist(
         else:
             songs = playwise_engine.song_lookup.fuzzy_search_artist(query)
         
-        return [song.to_dict() for song in songs]
+        return song_list_response(songs)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Search failed: {str(e)}")
 
@@ -198,7 +229,7 @@ async def search_songs(
     """General song search."""
     try:
         songs = playwise_engine.search_songs(query, search_type)
-        return [song.to_dict() for song in songs]
+        return song_list_response(songs)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Search failed: {str(e)}")
 
@@ -210,7 +241,7 @@ async def search_songs_by_rating(search_params: RatingSearchRequest):
             search_params.min_rating,
             search_params.max_rating
         )
-        return [song.to_dict() for song in songs]
+        return song_list_response(songs)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Rating search failed: {str(e)}")
 
@@ -232,7 +263,7 @@ async def create_playlist(playlist_data: PlaylistCreate):
 async def get_all_playlists():
     """Get all playlists."""
     try:
-        playlists = playwise_engine.playlist_engine.list_playlists()
+        playlists = playwise_engine.playlist_engine.iter_playlists()
         return [playlist.to_dict() for playlist in playlists]
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to retrieve playlists: {str(e)}")
@@ -259,7 +290,7 @@ async def set_current_playlist(playlist_id: str = Path(..., description="Playlis
     success = playwise_engine.playlist_engine.set_current_playlist(playlist_id)
     if not success:
         raise HTTPException(status_code=404, detail="Playlist not found")
-    return SuccessResponse(message="Current playlist updated successfully")
+    return success_response("Current playlist updated successfully")
 
 @app.delete("/playlists/{playlist_id}", response_model=SuccessResponse)
 async def delete_playlist(playlist_id: str = Path(..., description="Playlist ID")):
@@ -267,7 +298,7 @@ async def delete_playlist(playlist_id: str = Path(..., description="Playlist ID"
     success = playwise_engine.playlist_engine.delete_playlist(playlist_id)
     if not success:
         raise HTTPException(status_code=404, detail="Playlist not found")
-    return SuccessResponse(message="Playlist deleted successfully")
+    return success_response("Playlist deleted successfully")
 
 # ========== PLAYLIST SONG MANAGEMENT ENDPOINTS ==========
 
@@ -281,7 +312,7 @@ async def add_song_to_playlist(
     success = playwise_engine.add_song_to_playlist(song_id, playlist_id, position)
     if not success:
         raise HTTPException(status_code=400, detail="Failed to add song to playlist")
-    return SuccessResponse(message="Song added to playlist successfully")
+    return success_response("Song added to playlist successfully")
 
 @app.delete("/playlists/{playlist_id}/songs/{song_index}", response_model=SuccessResponse)
 async def remove_song_from_playlist(
@@ -292,7 +323,7 @@ async def remove_song_from_playlist(
     removed_song = playwise_engine.playlist_engine.delete_song(song_index, playlist_id)
     if not removed_song:
         raise HTTPException(status_code=400, detail="Failed to remove song from playlist")
-    return SuccessResponse(message="Song removed from playlist successfully")
+    return success_response("Song removed from playlist successfully")
 
 @app.put("/playlists/{playlist_id}/songs/move", response_model=SuccessResponse)
 async def move_song_in_playlist(
@@ -307,7 +338,7 @@ async def move_song_in_playlist(
     )
     if not success:
         raise HTTPException(status_code=400, detail="Failed to move song in playlist")
-    return SuccessResponse(message="Song moved successfully")
+    return success_response("Song moved successfully")
 
 @app.put("/playlists/{playlist_id}/reverse", response_model=SuccessResponse)
 async def reverse_playlist(playlist_id: str = Path(..., description="Playlist ID")):
@@ -315,7 +346,7 @@ async def reverse_playlist(playlist_id: str = Path(..., description="Playlist ID
     success = playwise_engine.playlist_engine.reverse_playlist(playlist_id)
     if not success:
         raise HTTPException(status_code=400, detail="Failed to reverse playlist")
-    return SuccessResponse(message="Playlist reversed successfully")
+    return success_response("Playlist reversed successfully")
 
 # ========== PLAYLIST SORTING ENDPOINTS ==========
 
@@ -365,13 +396,13 @@ async def play_song(
     success = playwise_engine.play_song(song_id, listen_duration)
     if not success:
         raise HTTPException(status_code=404, detail="Song not found")
-    return SuccessResponse(message="Song played and recorded in history")
+    return success_response("Song played and recorded in history")
 
 @app.get("/playback/history", response_model=List[SongResponse])
 async def get_playback_history(limit: int = Query(50, ge=1, le=100)):
     """Get recent playback history."""
-    history = playwise_engine.playback_history.get_recent_history(limit)
-    return [song.to_dict() for song in history]
+    history = playwise_engine.playback_history.iter_recent(limit)
+    return song_list_response(history)
 
 @app.post("/playback/undo", response_model=Dict[str, Any])
 async def undo_last_play():
@@ -385,7 +416,7 @@ async def undo_last_play():
 async def get_most_played_songs(limit: int = Query(10, ge=1, le=50)):
     """Get most played songs."""
     most_played = playwise_engine.playback_history.get_most_played_songs(limit)
-    return [song.to_dict() for song in most_played]
+    return song_list_response(most_played)
 
 # ========== RATING ENDPOINTS ==========
 
@@ -398,7 +429,7 @@ async def rate_song(
     success = playwise_engine.rate_song(song_id, rating)
     if not success:
         raise HTTPException(status_code=404, detail="Song not found")
-    return SuccessResponse(message=f"Song rated {rating} stars")
+    return success_response(f"Song rated {rating} stars")
 
 @app.get("/ratings/distribution", response_model=Dict[str, int])
 async def get_rating_distribution():
@@ -409,14 +440,14 @@ async def get_rating_distribution():
 async def get_top_rated_songs(limit: int = Query(10, ge=1, le=50)):
     """Get top rated songs."""
     top_rated = playwise_engine.song_rating_tree.get_top_rated_songs(limit)
-    return [song.to_dict() for song in top_rated]
+    return song_list_response(top_rated)
 
 # ========== FAVORITES ENDPOINTS ==========
 
 @app.get("/favorites", response_model=List[Dict[str, Any]])
 async def get_favorites(limit: int = Query(20, ge=1, le=100)):
     """Get favorite songs."""
-    return playwise_engine.favorites_queue.get_top_songs(limit)
+    return JSONResponse(content=playwise_engine.favorites_queue.get_top_songs(limit))
 
 @app.get("/favorites/stats", response_model=Dict[str, Any])
 async def get_favorites_stats():
@@ -433,11 +464,11 @@ async def get_recently_favorited(limit: int = Query(10, ge=1, le=50)):
 @app.post("/playlists/{playlist_id}/clean-duplicates", response_model=Dict[str, Any])
 async def clean_playlist_duplicates(
     playlist_id: str = Path(..., description="Playlist ID"),
-    strategy: str = Query("title_artist", regex="^(title_artist|title_artist_duration|title_only|strict)$")
+    strategy: DuplicateStrategy = Query(DuplicateStrategy.TITLE_ARTIST)
 ):
     """Clean duplicate songs from a playlist."""
     try:
-        result = playwise_engine.clean_duplicates(playlist_id, strategy)
+        result = playwise_engine.clean_duplicates(playlist_id, strategy.value)
         return result
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Duplicate cleaning failed: {str(e)}")
@@ -445,14 +476,14 @@ async def clean_playlist_duplicates(
 @app.get("/duplicates/analyze/{playlist_id}", response_model=Dict[str, Any])
 async def analyze_duplicates(
     playlist_id: str = Path(..., description="Playlist ID"),
-    strategy: str = Query("title_artist", regex="^(title_artist|title_artist_duration|title_only|strict)$")
+    strategy: DuplicateStrategy = Query(DuplicateStrategy.TITLE_ARTIST)
 ):
     """Analyze duplicates in a playlist without removing them."""
     songs = playwise_engine.playlist_engine.get_songs(playlist_id)
     if not songs:
         raise HTTPException(status_code=404, detail="Playlist not found or empty")
     
-    playwise_engine.auto_cleaner.set_duplicate_strategy(strategy)
+    playwise_engine.auto_cleaner.set_duplicate_strategy(strategy.value)
     stats = playwise_engine.auto_cleaner.get_duplicate_stats(songs)
     
     return stats
@@ -464,7 +495,7 @@ async def get_recommendations(limit: int = Query(10, ge=1, le=50)):
     """Get song recommendations."""
     try:
         recommendations = playwise_engine.get_recommendations(limit)
-        return [song.to_dict() for song in recommendations]
+        return song_list_response(recommendations)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to generate recommendations: {str(e)}")
 
@@ -473,8 +504,11 @@ async def get_recommendations(limit: int = Query(10, ge=1, le=50)):
 @app.get("/dashboard", response_model=Dict[str, Any])
 async def get_dashboard_data():
     """Get comprehensive dashboard data."""
+    # Unchanged snapshot sections reuse their cached JSON encoding, so the
+    # body is returned as-is rather than re-encoded from the dict
     try:
-        return playwise_engine.get_dashboard_data()
+        return Response(content=playwise_engine.get_dashboard_json(),
+                        media_type="application/json")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to generate dashboard data: {str(e)}")
 
@@ -486,16 +520,16 @@ async def get_system_stats():
 @app.get("/export/playlist/{playlist_id}", response_model=Dict[str, str])
 async def export_playlist(
     playlist_id: str = Path(..., description="Playlist ID"),
-    format: str = Query("json", regex="^(json|m3u)$")
+    format: ExportFormat = Query(ExportFormat.JSON)
 ):
     """Export a playlist in the specified format."""
     try:
-        exported_data = playwise_engine.export_playlist(playlist_id, format)
+        exported_data = playwise_engine.export_playlist(playlist_id, format.value)
         if not exported_data:
             raise HTTPException(status_code=404, detail="Playlist not found")
         
         return {
-            "format": format,
+            "format": format.value,
             "data": exported_data,
             "timestamp": datetime.now().isoformat()
         }
@@ -509,21 +543,23 @@ async def reset_performance_stats():
     """Reset all performance statistics."""
     playwise_engine.playlist_sorter.reset_stats()
     playwise_engine.auto_cleaner.reset_stats()
-    return SuccessResponse(message="Performance statistics reset successfully")
+    return success_response("Performance statistics reset successfully")
 
 @app.get("/admin/cache/clear", response_model=SuccessResponse)
 async def clear_caches():
     """Clear all system caches."""
     playwise_engine.system_snapshot.clear_cache()
     playwise_engine.auto_cleaner.clear_cache()
-    return SuccessResponse(message="Caches cleared successfully")
+    return success_response("Caches cleared successfully")
 
 # Run the application
 if __name__ == "__main__":
     uvicorn.run(
-        "main:app",
+        "api:app",
         host="0.0.0.0",
         port=8000,
-        reload=True,
+        reload=bool(os.getenv("DEV")),
+        loop="uvloop",
+        http="httptools",
         log_level="info"
     )
@@ -3,7 +3,8 @@ Auto Cleaner using HashSet implementation
 Removes duplicate songs based on composite keys
 """
 
-from typing import List, Dict, Set, Tuple
+from collections import Counter, OrderedDict
+from typing import Hashable, List, Dict, Tuple
 from models.song import Song
 
 class AutoCleaner:
@@ -19,9 +20,17 @@ class AutoCleaner:
     Space Complexity: O(n) for hash storage
     """
     
-    def __init__(self):
-        # Track seen songs by composite key
-        self.seen_keys: Set[str] = set()
+    def __init__(self, streaming_window: int = 10000):
+        # Track recently seen songs by composite key, bounded to the most
+        # recent streaming_window keys so streaming use keeps O(W) memory
+        self.seen_keys: OrderedDict[Hashable, None] = OrderedDict()
+        self.streaming_window = streaming_window
+        
+        # Recent get_duplicate_stats results, least recently used first
+        self._stats_cache: OrderedDict[Tuple, Dict[str, int]] = OrderedDict()
+        self.stats_cache_size = 16
+        # Lists longer than this are not memoized
+        self.stats_cache_max_songs = 10000
         
         # Different strategies for generating composite keys
         self.key_strategies = {
@@ -71,18 +80,51 @@ class AutoCleaner:
         seen_in_this_batch = set()
         key_generator = self.key_strategies[self.current_strategy]
         
+        # Bind methods locally to keep attribute lookups out of the loop
+        mark_seen = seen_in_this_batch.add
+        keep_song = unique_songs.append
+        
         for song in songs:
             composite_key = key_generator(song)
-            
             if composite_key not in seen_in_this_batch:
-                seen_in_this_batch.add(composite_key)
-                unique_songs.append(song)
-                self.unique_songs_processed += 1
-            else:
-                self.duplicates_found += 1
+                mark_seen(composite_key)
+                keep_song(song)
+        
+        self.unique_songs_processed += len(unique_songs)
+        self.duplicates_found += len(songs) - len(unique_songs)
         
         return unique_songs
     
+    def add_streaming(self, song: Song) -> bool:
+        """
+        Check a song from a stream against the recently seen keys.
+        
+        Keys are kept in least-recently-seen order; once more than
+        streaming_window keys are tracked the oldest one is forgotten, so
+        duplicates are only detected within that sliding window.
+        
+        Args:
+            song: Song arriving from the stream
+            
+        Returns:
+            bool: True if the song duplicates a recently seen song
+            
+        Time Complexity: O(1)
+        """
+        composite_key = self.key_strategies[self.current_strategy](song)
+        seen_keys = self.seen_keys
+        
+        if composite_key in seen_keys:
+            seen_keys.move_to_end(composite_key)
+            self.duplicates_found += 1
+            return True
+        
+        seen_keys[composite_key] = None
+        if len(seen_keys) > self.streaming_window:
+            seen_keys.popitem(last=False)
+        self.unique_songs_processed += 1
+        return False
+    
     def find_duplicates(self, songs: List[Song]) -> List[Tuple[Song, List[Song]]]:
         """
         Find duplicate songs in the provided list.
@@ -95,15 +137,13 @@ class AutoCleaner:
             
         Time Complexity: O(n)
         """
-        key_to_songs: Dict[str, List[Song]] = {}
+        key_to_songs: Dict[Hashable, List[Song]] = {}
         key_generator = self.key_strategies[self.current_strategy]
         
         # Group songs by composite key
+        group_for = key_to_songs.setdefault
         for song in songs:
-            composite_key = key_generator(song)
-            if composite_key not in key_to_songs:
-                key_to_songs[composite_key] = []
-            key_to_songs[composite_key].append(song)
+            group_for(key_generator(song), []).append(song)
         
         # Find groups with more than one song (duplicates)
         duplicate_groups = []
@@ -126,17 +166,47 @@ class AutoCleaner:
             
         Returns:
             Dict: Statistics about duplicates
+            
+        Time Complexity: O(n), with a cheaper O(n) id scan when the same
+        songs were analyzed recently and no key field has changed since
         """
-        duplicate_groups = self.find_duplicates(songs)
+        if len(songs) > self.stats_cache_max_songs:
+            # Building the id tuple key costs about as much as counting, so
+            # large lists are always counted and never memoized
+            stats = self._count_duplicate_stats(songs)
+        else:
+            # Song.key_revision changes whenever any song's key fields do, so
+            # a cached result for the same ids and strategy is still accurate
+            cache_key = (tuple(song.id for song in songs), self.current_strategy,
+                         Song.key_revision)
+            stats_cache = self._stats_cache
+            stats = stats_cache.get(cache_key)
+            
+            if stats is not None:
+                stats_cache.move_to_end(cache_key)
+            else:
+                stats = self._count_duplicate_stats(songs)
+                stats_cache[cache_key] = stats
+                if len(stats_cache) > self.stats_cache_size:
+                    stats_cache.popitem(last=False)
         
-        total_duplicates = sum(len(duplicates) for _, duplicates in duplicate_groups)
-        unique_songs = len(songs) - total_duplicates
+        self.duplicates_found += stats['duplicate_songs']
+        return dict(stats)
+    
+    def _count_duplicate_stats(self, songs: List[Song]) -> Dict[str, int]:
+        """Count duplicates in the song list under the current strategy."""
+        # Only counts per key are needed, so skip building the duplicate groups
+        key_counts = Counter(map(self.key_strategies[self.current_strategy], songs))
+        
+        unique_songs = len(key_counts)
+        total_duplicates = len(songs) - unique_songs
+        duplicate_groups = sum(1 for count in key_counts.values() if count > 1)
         
         return {
             'total_songs': len(songs),
             'unique_songs': unique_songs,
             'duplicate_songs': total_duplicates,
-            'duplicate_groups': len(duplicate_groups),
+            'duplicate_groups': duplicate_groups,
             'duplicate_percentage': (total_duplicates / len(songs) * 100) if songs else 0
         }
     
@@ -152,45 +222,48 @@ class AutoCleaner:
         Returns:
             List[Song]: Cleaned list
         """
-        key_to_best_song: Dict[str, Song] = {}
         key_generator = self.key_strategies[self.current_strategy]
         
+        if not keep_highest_rated:
+            # Keep the first occurrence
+            key_to_first_song: Dict[Hashable, Song] = {}
+            keep_first = key_to_first_song.setdefault
+            for song in songs:
+                keep_first(key_generator(song), song)
+            return list(key_to_first_song.values())
+        
+        # Keep the song with higher rating, or higher play count as tiebreaker;
+        # the stored score tuple is compared in one step
+        key_to_best: Dict[Hashable, Tuple[Song, Tuple[int, int]]] = {}
+        get_best = key_to_best.get
+        
         for song in songs:
             composite_key = key_generator(song)
-            
-            if composite_key not in key_to_best_song:
-                key_to_best_song[composite_key] = song
-            else:
-                existing_song = key_to_best_song[composite_key]
-                
-                if keep_highest_rated:
-                    # Keep the song with higher rating, or higher play count as tiebreaker
-                    if (song.rating > existing_song.rating or 
-                        (song.rating == existing_song.rating and 
-                         song.play_count > existing_song.play_count)):
-                        key_to_best_song[composite_key] = song
-                else:
-                    # Keep the first occurrence
-                    pass
-        
-        return list(key_to_best_song.values())
+            score = (song.rating, song.play_count)
+            current = get_best(composite_key)
+            if current is None or score > current[1]:
+                key_to_best[composite_key] = (song, score)
+        
+        return [best[0] for best in key_to_best.values()]
+    
+    # Multi-field keys are tuples: they hash without building a joined string,
+    # and fields containing "_" can't run into each other
     
-    def _generate_title_artist_key(self, song: Song) -> str:
+    def _generate_title_artist_key(self, song: Song) -> Tuple[str, str]:
         """Generate composite key from title and artist."""
-        return f"{song.title.lower().strip()}_{song.artist.lower().strip()}"
+        return (song.title_key, song.artist_key)
     
-    def _generate_full_key(self, song: Song) -> str:
+    def _generate_full_key(self, song: Song) -> Tuple[str, str, int]:
         """Generate composite key from title, artist, and duration."""
-        return f"{song.title.lower().strip()}_{song.artist.lower().strip()}_{song.duration}"
+        return (song.title_key, song.artist_key, song.duration)
     
     def _generate_title_key(self, song: Song) -> str:
         """Generate composite key from title only."""
-        return song.title.lower().strip()
+        return song.title_key
     
-    def _generate_strict_key(self, song: Song) -> str:
+    def _generate_strict_key(self, song: Song) -> Tuple[str, str, int, int]:
         """Generate strict key including all major attributes."""
-        return (f"{song.title.lower().strip()}_{song.artist.lower().strip()}_"
-                f"{song.duration}_{song.rating}")
+        return (song.title_key, song.artist_key, song.duration, song.rating)
     
     def merge_duplicate_metadata(self, original: Song, duplicates: List[Song]) -> Song:
         """
@@ -212,12 +285,12 @@ class AutoCleaner:
             total_listen_time += duplicate.listen_time
         
         # Update original with merged data
-        original.play_count = total_play_count
-        original.listen_time = total_listen_time
+        original.update_play_stats(total_play_count, total_listen_time)
         
         # Use highest rating
         highest_rating = max([original.rating] + [d.rating for d in duplicates])
-        original.rating = highest_rating
+        if highest_rating != original.rating:
+            original.update_rating(highest_rating)
         
         return original
     
@@ -249,12 +322,14 @@ class AutoCleaner:
             bool: True if all songs are unique
         """
         seen_keys = set()
+        mark_seen = seen_keys.add
         key_generator = self.key_strategies[self.current_strategy]
         
+        # Stops at the first duplicate instead of building every key
         for song in songs:
             composite_key = key_generator(song)
             if composite_key in seen_keys:
                 return False
-            seen_keys.add(composite_key)
+            mark_seen(composite_key)
         
         return True
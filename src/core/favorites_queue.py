@@ -4,18 +4,24 @@ Maintains a sorted queue of favorite songs by listen time
 """
 
 import heapq
-from typing import List, Dict, Optional
+from bisect import bisect_left, insort
+from typing import List, Dict, Optional, Tuple
 from models.song import Song
 
 class FavoriteItem:
     """Wrapper class for heap items to enable max-heap behavior with min-heap."""
     
+    __slots__ = ('song', 'priority', 'listen_time', 'play_count', 'valid')
+    
     def __init__(self, song: Song, priority_value: float):
         self.song = song
         # Negative value for max-heap behavior using min-heap
         self.priority = -priority_value
         self.listen_time = song.listen_time
         self.play_count = song.play_count
+        # Cleared when the item is superseded; stale entries stay in the heap
+        # until they surface at the top or the heap is compacted
+        self.valid = True
     
     def __lt__(self, other):
         # Primary sort by priority (listen time), secondary by play count
@@ -25,6 +31,10 @@ class FavoriteItem:
     
     def __eq__(self, other):
         return self.song.id == other.song.id if hasattr(other, 'song') else False
+    
+    def rank_key(self) -> Tuple[float, int, str]:
+        """Total ordering key used for the favorites ranking."""
+        return (self.priority, -self.play_count, self.song.id)
 
 class FavoritesQueue:
     """
@@ -33,16 +43,25 @@ class FavoritesQueue:
     
     Time Complexity:
     - Add song: O(log n)
-    - Update listen time: O(n) due to heap rebuild
-    - Get top songs: O(k log n) where k is number requested
+    - Update listen time: O(log n) amortized via lazy invalidation
+    - Get top songs: O(n log k) where k is number requested
+    - Get song position: O(log n) via a sorted ranking of live items
     
     Space Complexity: O(n) for heap storage
     """
     
     def __init__(self, max_size: int = 1000):
         self.heap: List[FavoriteItem] = []
-        self.song_index: Dict[str, int] = {}  # song_id -> heap_index
+        self.song_index: Dict[str, FavoriteItem] = {}  # song_id -> live heap item
+        # Sorted rank keys of live items, kept in step with song_index
+        self._ranking: List[Tuple[float, int, str]] = []
         self.max_size = max_size
+        self._invalid_count = 0
+        # Computed by get_queue_stats; reset whenever the live items change
+        self._stats_cache: Optional[Dict] = None
+        # Bumped whenever the live items change, alongside _stats_cache, and
+        # when a queued song changes (see mark_song_changed)
+        self.revision = 0
         
         # Metrics
         self.total_listen_time = 0
@@ -67,22 +86,26 @@ class FavoritesQueue:
         
         priority_value = listen_time if listen_time is not None else song.listen_time
         if listen_time is not None:
-            song.listen_time = listen_time
+            song.update_play_stats(listen_time=listen_time)
         
         favorite_item = FavoriteItem(song, priority_value)
         
         # If queue is full, check if new song should replace lowest priority
-        if len(self.heap) >= self.max_size:
+        if len(self.song_index) >= self.max_size:
+            self._discard_invalid_top()
             if priority_value > -self.heap[0].priority:
                 # Remove lowest priority item
                 removed_item = heapq.heappop(self.heap)
-                if removed_item.song.id in self.song_index:
-                    del self.song_index[removed_item.song.id]
+                del self.song_index[removed_item.song.id]
+                self._unrank(removed_item)
             else:
                 return False  # New song doesn't qualify for favorites
         
         heapq.heappush(self.heap, favorite_item)
-        self.song_index[song.id] = len(self.heap) - 1
+        self.song_index[song.id] = favorite_item
+        insort(self._ranking, favorite_item.rank_key())
+        self._stats_cache = None
+        self.revision += 1
         self.total_songs_added += 1
         self.total_listen_time += priority_value
         
@@ -99,27 +122,30 @@ class FavoritesQueue:
         Returns:
             bool: True if updated successfully
             
-        Time Complexity: O(n) due to heap rebuild
+        Time Complexity: O(log n) amortized
         """
-        # Find and update the song
-        updated = False
-        for item in self.heap:
-            if item.song.id == song_id:
-                old_time = item.listen_time
-                item.song.listen_time = new_time
-                item.listen_time = new_time
-                item.priority = -new_time
-                self.total_listen_time += (new_time - old_time)
-                updated = True
-                break
+        old_item = self.song_index.get(song_id)
+        if old_item is None:
+            return False
         
-        if updated:
-            # Rebuild heap to maintain heap property
-            heapq.heapify(self.heap)
-            self._rebuild_index()
-            return True
+        # Invalidate the old entry and push a replacement instead of
+        # re-heapifying; the stale entry is skipped when it is reached
+        old_item.valid = False
+        self._invalid_count += 1
+        self._unrank(old_item)
+        self._stats_cache = None
+        self.revision += 1
+        
+        song = old_item.song
+        song.update_play_stats(listen_time=new_time)
+        new_item = FavoriteItem(song, new_time)
+        heapq.heappush(self.heap, new_item)
+        self.song_index[song_id] = new_item
+        insort(self._ranking, new_item.rank_key())
+        self.total_listen_time += (new_time - old_item.listen_time)
+        self._compact_if_sparse()
         
-        return False
+        return True
     
     def get_top_songs(self, count: int) -> List[Dict]:
         """
@@ -131,26 +157,32 @@ class FavoritesQueue:
         Returns:
             List[Dict]: Top songs with metadata
             
-        Time Complexity: O(k log n) where k is count
+        Time Complexity: O(n log k) where k is count
         """
-        if not self.heap:
+        if not self.song_index or count <= 0:
             return []
         
-        # Create a copy of heap for extraction without modifying original
-        heap_copy = self.heap.copy()
-        top_songs = []
+        # Priorities are negated, so the smallest items are the top favorites;
+        # nsmallest keeps a bounded heap of size count instead of copying
+        top_items = heapq.nsmallest(count, self.song_index.values())
+        return [self._item_to_dict(item) for item in top_items]
+    
+    def get_top_favorite_songs(self, count: int) -> List[Song]:
+        """
+        Get the top favorite Song objects based on listen time.
         
-        for _ in range(min(count, len(heap_copy))):
-            if heap_copy:
-                item = heapq.heappop(heap_copy)
-                top_songs.append({
-                    'song': item.song.to_dict(),
-                    'listen_time': item.listen_time,
-                    'play_count': item.play_count,
-                    'priority_score': -item.priority
-                })
+        Args:
+            count: Number of top songs to retrieve
+            
+        Returns:
+            List[Song]: Top songs, highest priority first
+            
+        Time Complexity: O(n log k) where k is count
+        """
+        if not self.song_index or count <= 0:
+            return []
         
-        return top_songs
+        return [item.song for item in heapq.nsmallest(count, self.song_index.values())]
     
     def get_song_position(self, song_id: str) -> Optional[int]:
         """
@@ -161,18 +193,14 @@ class FavoritesQueue:
             
         Returns:
             Optional[int]: Position (1-based) or None if not found
+            
+        Time Complexity: O(log n)
         """
-        if song_id not in self.song_index:
+        item = self.song_index.get(song_id)
+        if item is None:
             return None
         
-        # Sort all items by priority to get position
-        sorted_items = sorted(self.heap, key=lambda x: x.priority)
-        
-        for i, item in enumerate(sorted_items):
-            if item.song.id == song_id:
-                return i + 1  # 1-based position
-        
-        return None
+        return bisect_left(self._ranking, item.rank_key()) + 1  # 1-based position
     
     def remove_song(self, song_id: str) -> bool:
         """
@@ -183,63 +211,56 @@ class FavoritesQueue:
             
         Returns:
             bool: True if removed successfully
+            
+        Time Complexity: O(log n) amortized
         """
-        if song_id not in self.song_index:
+        item = self.song_index.pop(song_id, None)
+        if item is None:
             return False
         
-        # Find and remove the song
-        self.heap = [item for item in self.heap if item.song.id != song_id]
-        heapq.heapify(self.heap)
-        
-        # Remove from index
-        del self.song_index[song_id]
-        
-        # Rebuild index
-        self._rebuild_index()
+        # Leave the entry in the heap as a tombstone
+        item.valid = False
+        self._invalid_count += 1
+        self._unrank(item)
+        self._stats_cache = None
+        self.revision += 1
+        self._compact_if_sparse()
         
         return True
     
     def get_favorites_by_artist(self, artist: str, limit: int = 10) -> List[Dict]:
         """Get favorite songs by a specific artist."""
-        artist_songs = []
         artist_lower = artist.lower()
+        artist_items = (
+            item for item in self.song_index.values()
+            if item.song.artist_lower == artist_lower
+        )
         
-        for item in self.heap:
-            if item.song.artist.lower() == artist_lower:
-                artist_songs.append({
-                    'song': item.song.to_dict(),
-                    'listen_time': item.listen_time,
-                    'play_count': item.play_count,
-                    'priority_score': -item.priority
-                })
-        
-        # Sort by priority and return top items
-        artist_songs.sort(key=lambda x: x['priority_score'], reverse=True)
-        return artist_songs[:limit]
+        # Take the highest priority items without sorting every match
+        top_items = heapq.nsmallest(limit, artist_items)
+        return [self._item_to_dict(item) for item in top_items]
     
     def get_recently_favorited(self, limit: int = 10) -> List[Dict]:
         """Get recently added favorite songs."""
-        # Sort by date_added and return most recent
-        recent_items = sorted(
-            self.heap,
-            key=lambda x: x.song.date_added,
-            reverse=True
+        # Select the most recent items by date_added without a full sort
+        recent_items = heapq.nlargest(
+            limit,
+            self.song_index.values(),
+            key=lambda x: x.song.date_added
         )
-        
-        result = []
-        for item in recent_items[:limit]:
-            result.append({
-                'song': item.song.to_dict(),
-                'listen_time': item.listen_time,
-                'play_count': item.play_count,
-                'priority_score': -item.priority
-            })
-        
-        return result
+        return [self._item_to_dict(item) for item in recent_items]
     
     def get_queue_stats(self) -> Dict:
-        """Get statistics about the favorites queue."""
-        if not self.heap:
+        """
+        Get statistics about the favorites queue.
+        
+        Time Complexity: O(1) when the queue is unchanged since the last call,
+        O(n) otherwise
+        """
+        if self._stats_cache is not None:
+            return dict(self._stats_cache)
+        
+        if not self.song_index:
             return {
                 'total_songs': 0,
                 'average_listen_time': 0,
@@ -248,38 +269,82 @@ class FavoritesQueue:
                 'capacity_used': 0
             }
         
-        listen_times = [-item.priority for item in self.heap]
+        listen_times = [-item.priority for item in self.song_index.values()]
         
-        return {
-            'total_songs': len(self.heap),
+        self._stats_cache = {
+            'total_songs': len(listen_times),
             'average_listen_time': sum(listen_times) / len(listen_times),
             'total_listen_time': sum(listen_times),
             'top_listen_time': max(listen_times),
             'lowest_listen_time': min(listen_times),
-            'capacity_used': len(self.heap) / self.max_size * 100,
+            'capacity_used': len(listen_times) / self.max_size * 100,
             'max_capacity': self.max_size
         }
+        return dict(self._stats_cache)
     
     def clear_queue(self) -> None:
         """Clear all songs from the favorites queue."""
         self.heap.clear()
         self.song_index.clear()
+        self._ranking.clear()
+        self._invalid_count = 0
+        self._stats_cache = None
+        self.revision += 1
         self.total_listen_time = 0
         self.total_songs_added = 0
     
+    def mark_song_changed(self, song_id: str) -> None:
+        """
+        Record that a queued song's fields changed. Listen time changes
+        still go through update_listen_time to re-rank the song.
+        """
+        if song_id in self.song_index:
+            self.revision += 1
+    
+    def get_size(self) -> int:
+        """Get the number of songs currently in the favorites queue."""
+        return len(self.song_index)
+    
     def is_empty(self) -> bool:
         """Check if the favorites queue is empty."""
-        return len(self.heap) == 0
+        return len(self.song_index) == 0
     
     def is_full(self) -> bool:
         """Check if the favorites queue is at capacity."""
-        return len(self.heap) >= self.max_size
+        return len(self.song_index) >= self.max_size
     
-    def _rebuild_index(self) -> None:
-        """Rebuild the song index after heap modifications."""
-        self.song_index.clear()
-        for i, item in enumerate(self.heap):
-            self.song_index[item.song.id] = i
+    @staticmethod
+    def _item_to_dict(item: FavoriteItem) -> Dict:
+        """Convert a heap item to its API representation."""
+        return {
+            'song': item.song.to_dict(),
+            'listen_time': item.listen_time,
+            'play_count': item.play_count,
+            'priority_score': -item.priority
+        }
+    
+    def _unrank(self, item: FavoriteItem) -> None:
+        """Remove an item's key from the sorted ranking."""
+        ranking = self._ranking
+        del ranking[bisect_left(ranking, item.rank_key())]
+    
+    def _discard_invalid_top(self) -> None:
+        """Pop stale entries until the heap top is a live item."""
+        heap = self.heap
+        while heap and not heap[0].valid:
+            heapq.heappop(heap)
+            self._invalid_count -= 1
+    
+    def _compact_if_sparse(self) -> None:
+        """Compact the heap once stale entries outnumber live ones."""
+        if self._invalid_count > len(self.heap) // 2:
+            self._compact()
+    
+    def _compact(self) -> None:
+        """Rebuild the heap from live items only, dropping stale entries."""
+        self.heap = list(self.song_index.values())
+        heapq.heapify(self.heap)
+        self._invalid_count = 0
     
     def bulk_update_from_playback_history(self, songs_with_times: List[tuple]) -> int:
         """
@@ -290,11 +355,48 @@ class FavoritesQueue:
             
         Returns:
             int: Number of songs successfully updated
+            
+        Time Complexity: O(m log n) where m is queued plus incoming songs and
+        n is max_size, with a single heap rebuild
         """
-        updated_count = 0
+        song_index = self.song_index
         
+        # Later entries for the same song override earlier ones, as they
+        # would with repeated add_song calls
+        latest: Dict[str, tuple] = {}
         for song, listen_time in songs_with_times:
-            if self.add_song(song, listen_time):
-                updated_count += 1
-        
-        return updated_count
+            latest[song.id] = (song, listen_time)
+        
+        new_items: Dict[str, FavoriteItem] = {}
+        for song_id, (song, listen_time) in latest.items():
+            song.update_play_stats(listen_time=listen_time)
+            new_items[song_id] = FavoriteItem(song, listen_time)
+            old_item = song_index.get(song_id)
+            if old_item is None:
+                self.total_listen_time += listen_time
+            else:
+                old_item.valid = False
+                self.total_listen_time += listen_time - old_item.listen_time
+        
+        candidates = [
+            item for song_id, item in song_index.items()
+            if song_id not in new_items
+        ]
+        candidates.extend(new_items.values())
+        
+        # Select the top max_size candidates and rebuild once instead of
+        # pushing (and possibly evicting) one song at a time; the sorted
+        # result of nsmallest is already a valid heap
+        self.heap = heapq.nsmallest(self.max_size, candidates)
+        self.song_index = {item.song.id: item for item in self.heap}
+        self._ranking = sorted(item.rank_key() for item in self.heap)
+        self._invalid_count = 0
+        self._stats_cache = None
+        self.revision += 1
+        
+        kept = self.song_index
+        self.total_songs_added += sum(
+            1 for song_id in new_items
+            if song_id in kept and song_id not in song_index
+        )
+        return sum(1 for song, _ in songs_with_times if song.id in kept)
@@ -3,7 +3,10 @@ Playback History using Stack implementation
 Tracks recently played songs with undo functionality
 """
 
-from typing import List, Optional
+import heapq
+from collections import Counter, deque
+from itertools import islice
+from typing import Deque, Dict, Iterator, List, Optional
 from models.song import Song
 
 class PlaybackHistory:
@@ -19,8 +22,16 @@ class PlaybackHistory:
     """
     
     def __init__(self, max_size: int = 100):
-        self.history: List[Song] = []
+        # Bounded deque evicts the oldest song in O(1) once full
+        self.history: Deque[Song] = deque(maxlen=max_size)
         self.max_size = max_size
+        
+        # Unique songs currently in history, with how many entries refer to each
+        self._unique_by_id: Dict[str, Song] = {}
+        self._id_count: Counter = Counter()
+        # Bumped on every play, undo and clear, and when a song in the history
+        # changes (see mark_song_changed)
+        self.revision = 0
     
     def add_to_history(self, song: Song) -> None:
         """
@@ -31,11 +42,15 @@ class PlaybackHistory:
             
         Time Complexity: O(1)
         """
-        # Remove oldest song if at max capacity
-        if len(self.history) >= self.max_size:
-            self.history.pop(0)  # Remove from front (oldest)
+        history = self.history
+        if history and len(history) == history.maxlen:
+            # The append below evicts the oldest entry
+            self._release(history[0])
         
-        self.history.append(song)
+        history.append(song)
+        self._id_count[song.id] += 1
+        self._unique_by_id[song.id] = song
+        self.revision += 1
         
         # Update song statistics
         song.increment_play_count()
@@ -50,7 +65,10 @@ class PlaybackHistory:
         Time Complexity: O(1)
         """
         if self.history:
-            return self.history.pop()
+            song = self.history.pop()
+            self._release(song)
+            self.revision += 1
+            return song
         return None
     
     def get_recent_history(self, k: int) -> List[Song]:
@@ -68,8 +86,22 @@ class PlaybackHistory:
         if k <= 0:
             return []
         
-        # Return reversed to show most recent first
-        return list(reversed(self.history[-k:]))
+        return list(self.iter_recent(k))
+    
+    def iter_recent(self, k: int) -> Iterator[Song]:
+        """
+        Iterate over the k most recently played songs without copying them.
+        
+        History must not be modified while iterating.
+        
+        Args:
+            k: Number of recent songs to yield
+            
+        Returns:
+            Iterator[Song]: Recent songs (most recent first)
+        """
+        # Walk from the newest end to show most recent first
+        return islice(reversed(self.history), max(k, 0))
     
     def get_all_history(self) -> List[Song]:
         """
@@ -83,6 +115,14 @@ class PlaybackHistory:
     def clear_history(self) -> None:
         """Clear all playback history."""
         self.history.clear()
+        self._unique_by_id.clear()
+        self._id_count.clear()
+        self.revision += 1
+    
+    def mark_song_changed(self, song_id: str) -> None:
+        """Record that a song's fields changed if it is in the history."""
+        if song_id in self._id_count:
+            self.revision += 1
     
     def get_history_size(self) -> int:
         """Get current number of songs in history."""
@@ -101,30 +141,37 @@ class PlaybackHistory:
             
         Returns:
             List[Song]: Songs sorted by play count (descending)
+            
+        Time Complexity: O(u log limit) where u is unique songs in history
         """
-        # Get unique songs and sort by play count
-        unique_songs = {}
-        for song in self.history:
-            if song.id not in unique_songs:
-                unique_songs[song.id] = song
+        if limit <= 0:
+            return []
         
-        sorted_songs = sorted(
-            unique_songs.values(),
-            key=lambda s: s.play_count,
-            reverse=True
+        return heapq.nlargest(
+            limit,
+            self._unique_by_id.values(),
+            key=lambda s: s.play_count
         )
-        
-        return sorted_songs[:limit]
+    
+    def _release(self, song: Song) -> None:
+        """Drop one history reference to a song from the unique-song index."""
+        song_id = song.id
+        remaining = self._id_count[song_id] - 1
+        if remaining:
+            self._id_count[song_id] = remaining
+        else:
+            del self._id_count[song_id]
+            del self._unique_by_id[song_id]
     
     def get_recently_played_artists(self, limit: int = 10) -> List[str]:
-        """Get recently played artists."""
+        """Get recently played artists, ignoring differences in case."""
         artists = []
         seen = set()
         
         for song in reversed(self.history):
-            if song.artist not in seen:
+            if song.artist_lower not in seen:
                 artists.append(song.artist)
-                seen.add(song.artist)
+                seen.add(song.artist_lower)
                 if len(artists) >= limit:
                     break
         
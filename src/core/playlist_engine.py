@@ -1,23 +1,15 @@
 """
-Playlist Engine using Doubly Linked List implementation
+Playlist Engine backed by array-based playlists
 Manages ordered song collections with efficient insertion, deletion, and reordering
 """
 
-from typing import List, Optional, Dict
+from typing import Iterable, List, Optional, Dict
 from models.song import Song
 from models.playlist import Playlist
 
-class PlaylistNode:
-    """Node for doubly linked list implementation"""
-    
-    def __init__(self, song: Song):
-        self.song = song
-        self.next: Optional['PlaylistNode'] = None
-        self.prev: Optional['PlaylistNode'] = None
-
 class PlaylistEngine:
     """
-    Manages playlists using doubly linked list for efficient operations.
+    Manages playlists stored as contiguous song lists.
     
     Time Complexity:
     - Add song: O(1) at head/tail, O(n) at arbitrary position
@@ -57,9 +49,17 @@ class PlaylistEngine:
             return True
         return False
     
+    def iter_playlists(self) -> Iterable[Playlist]:
+        """
+        Iterate over all playlists without copying them into a list.
+        
+        Playlists must not be created or deleted while iterating.
+        """
+        return self.playlists.values()
+    
     def list_playlists(self) -> List[Playlist]:
         """Get all playlists."""
-        return list(self.playlists.values())
+        return list(self.iter_playlists())
     
     def delete_playlist(self, playlist_id: str) -> bool:
         """Delete a playlist."""
@@ -77,10 +77,24 @@ class PlaylistEngine:
         Time Complexity: O(1) for append, O(n) for specific position
         """
         target_playlist = self._get_target_playlist(playlist_id)
-        if target_playlist:
+        if target_playlist is not None:
             return target_playlist.add_song(song, position)
         return False
     
+    def append_song(self, song: Song, /, playlist_id: Optional[str] = None) -> bool:
+        """
+        Append a song to the end of the specified playlist (or current playlist).
+        
+        Fast path for add_song with position=-1.
+        
+        Time Complexity: O(1)
+        """
+        target_playlist = self._get_target_playlist(playlist_id)
+        if target_playlist is not None:
+            target_playlist.append_song(song)
+            return True
+        return False
+    
     def delete_song(self, index: int, playlist_id: Optional[str] = None) -> Optional[Song]:
         """
         Delete a song at the specified index.
@@ -88,7 +102,7 @@ class PlaylistEngine:
         Time Complexity: O(n)
         """
         target_playlist = self._get_target_playlist(playlist_id)
-        if target_playlist:
+        if target_playlist is not None:
             return target_playlist.remove_song(index)
         return None
     
@@ -99,7 +113,7 @@ class PlaylistEngine:
         Time Complexity: O(n)
         """
         target_playlist = self._get_target_playlist(playlist_id)
-        if target_playlist:
+        if target_playlist is not None:
             return target_playlist.move_song(from_idx, to_idx)
         return False
     
@@ -110,25 +124,30 @@ class PlaylistEngine:
         Time Complexity: O(n)
         """
         target_playlist = self._get_target_playlist(playlist_id)
-        if target_playlist:
+        if target_playlist is not None:
             target_playlist.reverse_playlist()
             return True
         return False
     
     def get_songs(self, playlist_id: Optional[str] = None) -> List[Song]:
-        """Get all songs from the specified playlist."""
+        """
+        Get all songs from the specified playlist.
+        
+        This is the playlist's live list, for reading only; change it through
+        the Playlist methods or replace_songs.
+        """
         target_playlist = self._get_target_playlist(playlist_id)
-        return target_playlist.songs if target_playlist else []
+        return target_playlist.songs if target_playlist is not None else []
     
     def get_song_count(self, playlist_id: Optional[str] = None) -> int:
         """Get the number of songs in the playlist."""
         target_playlist = self._get_target_playlist(playlist_id)
-        return len(target_playlist) if target_playlist else 0
+        return len(target_playlist) if target_playlist is not None else 0
     
     def find_song_by_id(self, song_id: str, playlist_id: Optional[str] = None) -> Optional[int]:
         """Find song index by ID in the specified playlist."""
         target_playlist = self._get_target_playlist(playlist_id)
-        if target_playlist:
+        if target_playlist is not None:
             return target_playlist.find_song_by_id(song_id)
         return None
     
@@ -143,12 +162,20 @@ class PlaylistEngine:
     def clear_playlist(self, playlist_id: Optional[str] = None) -> bool:
         """Clear all songs from the specified playlist."""
         target_playlist = self._get_target_playlist(playlist_id)
-        if target_playlist:
-            target_playlist.songs.clear()
+        if target_playlist is not None:
+            target_playlist.clear()
+            return True
+        return False
+    
+    def replace_songs(self, songs: List[Song], playlist_id: Optional[str] = None) -> bool:
+        """Replace all songs of the specified playlist in a single update."""
+        target_playlist = self._get_target_playlist(playlist_id)
+        if target_playlist is not None:
+            target_playlist.replace_songs(songs)
             return True
         return False
     
     def get_total_duration(self, playlist_id: Optional[str] = None) -> int:
         """Get total duration of the playlist in seconds."""
         target_playlist = self._get_target_playlist(playlist_id)
-        return target_playlist.get_total_duration() if target_playlist else 0
+        return target_playlist.get_total_duration() if target_playlist is not None else 0
@@ -3,8 +3,10 @@ Playlist Sorter implementing multiple sorting algorithms
 Sorts playlists based on various criteria with performance comparison
 """
 
-from typing import List, Callable, Any
+from typing import List, Callable, Any, Tuple
 from enum import Enum
+from operator import attrgetter
+import random
 import time
 from models.song import Song
 
@@ -34,11 +36,25 @@ class PlaylistSorter:
     """
     
     def __init__(self):
-        self.last_sort_time = 0.0
+        # Every criterion sorts on a plain attribute (titles and artists use
+        # the normalized keys cached on Song), so keys are read by attrgetter
+        # in C instead of through a Python lambda per song
+        self.attribute_key_funcs = {
+            'title': attrgetter('title_key'),
+            'artist': attrgetter('artist_key'),
+            'duration': attrgetter('duration'),
+            'rating': attrgetter('rating'),
+            'date_added': attrgetter('date_added'),
+            'play_count': attrgetter('play_count')
+        }
+        
+        # Timings are accumulated as integer nanoseconds and only converted
+        # to seconds when reported
+        self.last_sort_time_ns = 0
         self.sort_stats = {
-            'merge': {'calls': 0, 'total_time': 0.0},
-            'quick': {'calls': 0, 'total_time': 0.0},
-            'builtin': {'calls': 0, 'total_time': 0.0}
+            'merge': {'calls': 0, 'total_time_ns': 0},
+            'quick': {'calls': 0, 'total_time_ns': 0},
+            'builtin': {'calls': 0, 'total_time_ns': 0}
         }
     
     def sort_by_title(self, songs: List[Song], reverse: bool = False, 
@@ -56,37 +72,37 @@ class PlaylistSorter:
             
         Time Complexity: O(n log n)
         """
-        key_func = lambda song: song.title.lower()
+        key_func = self.attribute_key_funcs['title']
         return self._sort_with_algorithm(songs, key_func, reverse, algorithm)
     
     def sort_by_artist(self, songs: List[Song], reverse: bool = False, 
                       algorithm: str = "builtin") -> List[Song]:
         """Sort songs by artist name."""
-        key_func = lambda song: song.artist.lower()
+        key_func = self.attribute_key_funcs['artist']
         return self._sort_with_algorithm(songs, key_func, reverse, algorithm)
     
     def sort_by_duration(self, songs: List[Song], reverse: bool = False, 
                         algorithm: str = "builtin") -> List[Song]:
         """Sort songs by duration."""
-        key_func = lambda song: song.duration
+        key_func = self.attribute_key_funcs['duration']
         return self._sort_with_algorithm(songs, key_func, reverse, algorithm)
     
     def sort_by_rating(self, songs: List[Song], reverse: bool = False, 
                       algorithm: str = "builtin") -> List[Song]:
         """Sort songs by rating."""
-        key_func = lambda song: song.rating
+        key_func = self.attribute_key_funcs['rating']
         return self._sort_with_algorithm(songs, key_func, reverse, algorithm)
     
     def sort_by_date_added(self, songs: List[Song], reverse: bool = False, 
                           algorithm: str = "builtin") -> List[Song]:
         """Sort songs by date added."""
-        key_func = lambda song: song.date_added
+        key_func = self.attribute_key_funcs['date_added']
         return self._sort_with_algorithm(songs, key_func, reverse, algorithm)
     
     def sort_by_play_count(self, songs: List[Song], reverse: bool = False, 
                           algorithm: str = "builtin") -> List[Song]:
         """Sort songs by play count."""
-        key_func = lambda song: song.play_count
+        key_func = self.attribute_key_funcs['play_count']
         return self._sort_with_algorithm(songs, key_func, reverse, algorithm)
     
     def _sort_with_algorithm(self, songs: List[Song], key_func: Callable, 
@@ -103,92 +119,241 @@ class PlaylistSorter:
         Returns:
             List[Song]: Sorted list
         """
-        start_time = time.time()
+        start_time = time.perf_counter_ns()
         
         # Create a copy to avoid modifying original
-        songs_copy = songs.copy()
+        result = self._run_sort(songs.copy(), key_func, reverse, algorithm)
+        
+        # Track performance
+        sort_time_ns = time.perf_counter_ns() - start_time
+        self.last_sort_time_ns = sort_time_ns
+        
+        if algorithm in self.sort_stats:
+            self.sort_stats[algorithm]['calls'] += 1
+            self.sort_stats[algorithm]['total_time_ns'] += sort_time_ns
+        
+        return result
+    
+    def _run_sort(self, songs: List[Song], key_func: Callable,
+                  reverse: bool, algorithm: str) -> List[Song]:
+        """
+        Sort songs with the given algorithm, without recording stats.
         
+        Args:
+            songs: Songs to sort (may be reordered in place)
+            key_func: Function to extract sort key
+            reverse: Sort in descending order if True
+            algorithm: Algorithm to use
+            
+        Returns:
+            List[Song]: Sorted list
+        """
         if algorithm == "merge":
-            result = self._merge_sort(songs_copy, key_func)
+            # Extract each key once; only the keys are compared, never the songs
+            decorated = [(key_func(song), song) for song in songs]
+            result = [song for _, song in self._merge_sort(decorated)]
         elif algorithm == "quick":
-            result = self._quick_sort(songs_copy, key_func)
+            keys = [key_func(song) for song in songs]
+            self._quick_sort(keys, songs)
+            result = songs
         else:  # builtin
-            result = sorted(songs_copy, key=key_func)
+            songs.sort(key=key_func, reverse=reverse)
+            return songs
         
+        # Keys can be any comparable type, so descending order is produced
+        # by reversing rather than by negating keys
         if reverse:
             result.reverse()
-        
-        # Track performance
-        end_time = time.time()
-        sort_time = end_time - start_time
-        self.last_sort_time = sort_time
-        
-        if algorithm in self.sort_stats:
-            self.sort_stats[algorithm]['calls'] += 1
-            self.sort_stats[algorithm]['total_time'] += sort_time
-        
         return result
     
-    def _merge_sort(self, songs: List[Song], key_func: Callable) -> List[Song]:
+    # Natural runs shorter than this are extended with binary insertion sort
+    MIN_RUN = 16
+    
+    def _merge_sort(self, items: List[Tuple[Any, Song]]) -> List[Tuple[Any, Song]]:
         """
-        Merge sort implementation.
+        Adaptive merge sort over (key, song) pairs (powersort).
         
-        Time Complexity: O(n log n)
+        Scans for existing ascending or strictly descending runs, reversing
+        the descending ones, and merges adjacent runs following powersort's
+        node-power rule so that merges stay balanced. Already sorted or
+        reversed input takes a single O(n) pass.
+        
+        Time Complexity: O(n log n), O(n) on presorted input
         Space Complexity: O(n)
         Stability: Stable
         """
-        if len(songs) <= 1:
-            return songs
+        n = len(items)
+        if n <= 1:
+            return items
         
-        mid = len(songs) // 2
-        left_half = songs[:mid]
-        right_half = songs[mid:]
+        # Each stack entry is a pending run (start, end, power of its right boundary)
+        stack: List[Tuple[int, int, int]] = []
+        start_a, end_a = 0, self._extend_run(items, 0, n)
+        
+        while end_a < n:
+            start_b, end_b = end_a, self._extend_run(items, end_a, n)
+            power = self._node_power(start_a, end_a, end_b, n)
+            
+            while stack and stack[-1][2] > power:
+                start_prev, end_prev, _ = stack.pop()
+                items[start_prev:end_a] = self._merge(items[start_prev:end_prev],
+                                                      items[end_prev:end_a])
+                start_a = start_prev
+            
+            stack.append((start_a, end_a, power))
+            start_a, end_a = start_b, end_b
         
-        left_sorted = self._merge_sort(left_half, key_func)
-        right_sorted = self._merge_sort(right_half, key_func)
+        while stack:
+            start_prev, end_prev, _ = stack.pop()
+            items[start_prev:end_a] = self._merge(items[start_prev:end_prev],
+                                                  items[end_prev:end_a])
         
-        return self._merge(left_sorted, right_sorted, key_func)
+        return items
     
-    def _merge(self, left: List[Song], right: List[Song], key_func: Callable) -> List[Song]:
-        """Merge two sorted lists."""
-        result = []
-        i = j = 0
-        
-        while i < len(left) and j < len(right):
-            if key_func(left[i]) <= key_func(right[j]):
-                result.append(left[i])
-                i += 1
+    def _extend_run(self, items: List[Tuple[Any, Song]], lo: int, n: int) -> int:
+        """
+        Find the natural run starting at lo and return its end (exclusive).
+        
+        Strictly descending runs are reversed in place (strictness keeps the
+        sort stable); short runs are extended to MIN_RUN by binary insertion.
+        """
+        hi = lo + 1
+        if hi < n:
+            if items[hi][0] < items[lo][0]:
+                while hi + 1 < n and items[hi + 1][0] < items[hi][0]:
+                    hi += 1
+                items[lo:hi + 1] = items[lo:hi + 1][::-1]
             else:
-                result.append(right[j])
-                j += 1
+                while hi + 1 < n and not items[hi + 1][0] < items[hi][0]:
+                    hi += 1
+            hi += 1
+        
+        forced_end = min(lo + self.MIN_RUN, n)
+        while hi < forced_end:
+            item = items[hi]
+            key = item[0]
+            # Insert after any equal keys to stay stable
+            left, right = lo, hi
+            while left < right:
+                middle = (left + right) // 2
+                if key < items[middle][0]:
+                    right = middle
+                else:
+                    left = middle + 1
+            items[left + 1:hi + 1] = items[left:hi]
+            items[left] = item
+            hi += 1
+        
+        return hi
+    
+    @staticmethod
+    def _node_power(start_a: int, end_a: int, end_b: int, n: int) -> int:
+        """
+        Powersort node power of the boundary between runs [start_a, end_a)
+        and [end_a, end_b): the depth of the first level of a perfectly
+        balanced merge tree at which the two run midpoints fall apart.
+        """
+        # Run midpoints doubled to stay in integers, as fractions of 2n
+        mid_a = start_a + end_a
+        mid_b = end_a + end_b
+        two_n = 2 * n
+        power = 0
+        while mid_a * (1 << power) // two_n == mid_b * (1 << power) // two_n:
+            power += 1
+        return power
+    
+    def _merge(self, left: List[Tuple[Any, Song]],
+               right: List[Tuple[Any, Song]]) -> List[Tuple[Any, Song]]:
+        """Merge two sorted lists of (key, song) pairs."""
+        left_len, right_len = len(left), len(right)
+        # Preallocate the output and fill it by index instead of growing it
+        result = [None] * (left_len + right_len)
+        i = j = k = 0
+        
+        if left_len and right_len:
+            # Keep the current head of each side in locals so every step
+            # indexes only the side it advances
+            left_item, right_item = left[0], right[0]
+            left_key, right_key = left_item[0], right_item[0]
+            while True:
+                if left_key <= right_key:
+                    result[k] = left_item
+                    k += 1
+                    i += 1
+                    if i == left_len:
+                        break
+                    left_item = left[i]
+                    left_key = left_item[0]
+                else:
+                    result[k] = right_item
+                    k += 1
+                    j += 1
+                    if j == right_len:
+                        break
+                    right_item = right[j]
+                    right_key = right_item[0]
         
         # Add remaining elements
-        result.extend(left[i:])
-        result.extend(right[j:])
+        if i < left_len:
+            result[k:] = left[i:]
+        else:
+            result[k:] = right[j:]
         
         return result
     
-    def _quick_sort(self, songs: List[Song], key_func: Callable) -> List[Song]:
+    def _quick_sort(self, keys: List[Any], songs: List[Song]) -> None:
         """
-        Quick sort implementation.
+        In-place quick sort of songs by their precomputed keys.
+        
+        keys and songs are parallel lists and are permuted together. Uses a
+        randomized median-of-three pivot and 3-way (Dutch national flag)
+        partitioning, with an explicit stack instead of recursion.
         
         Time Complexity: O(n log n) average, O(n²) worst
-        Space Complexity: O(log n) average
+        Space Complexity: O(log n) for the range stack
         Stability: Unstable
         """
-        if len(songs) <= 1:
-            return songs
+        randint = random.randint
+        stack = [(0, len(keys) - 1)]
         
-        pivot = songs[len(songs) // 2]
-        pivot_key = key_func(pivot)
-        
-        left = [x for x in songs if key_func(x) < pivot_key]
-        middle = [x for x in songs if key_func(x) == pivot_key]
-        right = [x for x in songs if key_func(x) > pivot_key]
-        
-        return (self._quick_sort(left, key_func) + 
-                middle + 
-                self._quick_sort(right, key_func))
+        while stack:
+            lo, hi = stack.pop()
+            if lo >= hi:
+                continue
+            
+            # Median of three randomly sampled keys guards against the
+            # quadratic case on sorted, reversed or otherwise patterned input
+            a = keys[randint(lo, hi)]
+            b = keys[randint(lo, hi)]
+            c = keys[randint(lo, hi)]
+            if a < b:
+                pivot = b if b < c else (c if a < c else a)
+            else:
+                pivot = a if a < c else (c if b < c else b)
+            
+            # keys[lo:lt] < pivot, keys[lt:i] == pivot, keys[gt+1:hi+1] > pivot
+            lt, i, gt = lo, lo, hi
+            while i <= gt:
+                key = keys[i]
+                if key < pivot:
+                    keys[lt], keys[i] = key, keys[lt]
+                    songs[lt], songs[i] = songs[i], songs[lt]
+                    lt += 1
+                    i += 1
+                elif pivot < key:
+                    keys[gt], keys[i] = key, keys[gt]
+                    songs[gt], songs[i] = songs[i], songs[gt]
+                    gt -= 1
+                else:
+                    i += 1
+            
+            # Push the larger range first so the stack stays O(log n)
+            if lt - lo > hi - gt:
+                stack.append((lo, lt - 1))
+                stack.append((gt + 1, hi))
+            else:
+                stack.append((gt + 1, hi))
+                stack.append((lo, lt - 1))
     
     def sort_by_multiple_criteria(self, songs: List[Song], 
                                  criteria_list: List[tuple]) -> List[Song]:
@@ -211,41 +376,16 @@ class PlaylistSorter:
         if not criteria_list:
             return songs.copy()
         
-        # Create key function for multiple criteria
-        def multi_key(song):
-            keys = []
-            for criteria, reverse in criteria_list:
-                if criteria == 'title':
-                    key = song.title.lower()
-                elif criteria == 'artist':
-                    key = song.artist.lower()
-                elif criteria == 'duration':
-                    key = song.duration
-                elif criteria == 'rating':
-                    key = song.rating
-                elif criteria == 'date_added':
-                    key = song.date_added
-                elif criteria == 'play_count':
-                    key = song.play_count
-                else:
-                    key = 0
-                
-                # Negate for reverse order
-                if reverse:
-                    if isinstance(key, str):
-                        # For strings, we'll handle reverse in the main sort
-                        keys.append((key, True))
-                    else:
-                        keys.append(-key)
-                else:
-                    if isinstance(key, str):
-                        keys.append((key, False))
-                    else:
-                        keys.append(key)
-            
-            return keys
+        # Sort once per criterion from least to most significant; each pass
+        # is stable, so ties keep the order set by the less significant
+        # criteria and reverse works for string keys too
+        result = songs.copy()
+        for criteria, reverse in reversed(criteria_list):
+            key_func = self.attribute_key_funcs.get(criteria)
+            if key_func is not None:
+                result.sort(key=key_func, reverse=reverse)
         
-        return sorted(songs, key=multi_key)
+        return result
     
     def benchmark_algorithms(self, songs: List[Song], 
                            criteria: str = "duration") -> dict:
@@ -262,47 +402,49 @@ class PlaylistSorter:
         key_func = self._get_key_function(criteria)
         results = {}
         
+        if not songs:
+            return {
+                algorithm: {'avg_time': 0, 'time_per_item': 0}
+                for algorithm in ["merge", "quick", "builtin"]
+            }
+        
+        # Each trial times the same sort sort_playlist runs, key extraction
+        # included; the input is refilled into a reused buffer outside the
+        # timed region
+        song_buffer = [None] * len(songs)
+        
         for algorithm in ["merge", "quick", "builtin"]:
-            start_time = time.time()
+            total_time = 0.0
             
             # Sort multiple times for more accurate measurement
             for _ in range(5):
-                self._sort_with_algorithm(songs, key_func, False, algorithm)
+                song_buffer[:] = songs
+                start_time = time.perf_counter()
+                self._run_sort(song_buffer, key_func, False, algorithm)
+                total_time += time.perf_counter() - start_time
             
-            avg_time = (time.time() - start_time) / 5
+            avg_time = total_time / 5
             results[algorithm] = {
                 'avg_time': avg_time,
-                'time_per_item': avg_time / len(songs) if songs else 0
+                'time_per_item': avg_time / len(songs)
             }
         
         return results
     
     def _get_key_function(self, criteria: str) -> Callable:
         """Get key function for the specified criteria."""
-        if criteria == "title":
-            return lambda song: song.title.lower()
-        elif criteria == "artist":
-            return lambda song: song.artist.lower()
-        elif criteria == "duration":
-            return lambda song: song.duration
-        elif criteria == "rating":
-            return lambda song: song.rating
-        elif criteria == "date_added":
-            return lambda song: song.date_added
-        elif criteria == "play_count":
-            return lambda song: song.play_count
-        else:
-            return lambda song: song.title.lower()
+        return self.attribute_key_funcs.get(criteria, self.attribute_key_funcs['title'])
     
     def get_performance_stats(self) -> dict:
         """Get performance statistics for all algorithms."""
         stats = {}
         for algorithm, data in self.sort_stats.items():
             if data['calls'] > 0:
+                total_time = data['total_time_ns'] / 1e9
                 stats[algorithm] = {
                     'total_calls': data['calls'],
-                    'total_time': data['total_time'],
-                    'average_time': data['total_time'] / data['calls']
+                    'total_time': total_time,
+                    'average_time': total_time / data['calls']
                 }
             else:
                 stats[algorithm] = {
@@ -316,8 +458,8 @@ class PlaylistSorter:
     def reset_stats(self) -> None:
         """Reset performance statistics."""
         for algorithm in self.sort_stats:
-            self.sort_stats[algorithm] = {'calls': 0, 'total_time': 0.0}
+            self.sort_stats[algorithm] = {'calls': 0, 'total_time_ns': 0}
     
     def get_last_sort_time(self) -> float:
-        """Get the time taken for the last sort operation."""
-        return self.last_sort_time
\ No newline at end of file
+        """Get the time taken for the last sort operation, in seconds."""
+        return self.last_sort_time_ns / 1e9
\ No newline at end of file
@@ -3,7 +3,9 @@ Song Lookup using HashMap implementation
 Provides instant retrieval of songs by ID, title, or artist
 """
 
-from typing import Dict, List, Optional, Set
+from bisect import bisect_right
+from itertools import islice
+from typing import Dict, Iterable, List, Optional, Tuple
 from models.song import Song
 
 class SongLookup:
@@ -28,8 +30,20 @@ class SongLookup:
         self.songs_by_title: Dict[str, List[Song]] = {}
         self.songs_by_artist: Dict[str, List[Song]] = {}
         
-        # For efficient fuzzy search
-        self.all_songs: Set[Song] = set()
+        # Lookup keys joined into one string so substring search runs in C;
+        # rebuilt lazily after the set of keys changes
+        self._title_search_index: Optional[Tuple[str, List[int], List[str]]] = None
+        self._artist_search_index: Optional[Tuple[str, List[int], List[str]]] = None
+        
+        # Trigram -> keys containing it, for fuzzy queries of 3+ characters.
+        # Postings are dicts used as ordered sets so matches keep key order.
+        # Built on the first such query, then kept up to date as keys change
+        self._title_trigrams: Optional[Dict[str, Dict[str, None]]] = None
+        self._artist_trigrams: Optional[Dict[str, Dict[str, None]]] = None
+        
+        # Bumped whenever songs are added or removed, or a held song's fields
+        # change (see mark_song_changed), for caches built over the library
+        self.revision = 0
     
     def add_song(self, song: Song) -> bool:
         """
@@ -48,28 +62,32 @@ class SongLookup:
         
         # Add to primary lookup
         self.songs_by_id[song.id] = song
+        self.revision += 1
         
         # Add to secondary lookups
         self._add_to_title_lookup(song)
         self._add_to_artist_lookup(song)
         
-        # Add to set for efficient operations
-        self.all_songs.add(song)
-        
         return True
     
     def _add_to_title_lookup(self, song: Song) -> None:
         """Add song to title lookup table."""
-        title_key = song.title.lower().strip()
+        title_key = song.title_key
         if title_key not in self.songs_by_title:
             self.songs_by_title[title_key] = []
+            self._title_search_index = None
+            if self._title_trigrams is not None:
+                self._index_trigrams(self._title_trigrams, title_key)
         self.songs_by_title[title_key].append(song)
     
     def _add_to_artist_lookup(self, song: Song) -> None:
         """Add song to artist lookup table."""
-        artist_key = song.artist.lower().strip()
+        artist_key = song.artist_key
         if artist_key not in self.songs_by_artist:
             self.songs_by_artist[artist_key] = []
+            self._artist_search_index = None
+            if self._artist_trigrams is not None:
+                self._index_trigrams(self._artist_trigrams, artist_key)
         self.songs_by_artist[artist_key].append(song)
     
     def get_song(self, song_id: str) -> Optional[Song]:
@@ -126,18 +144,28 @@ class SongLookup:
         Returns:
             List[Song]: Songs with titles containing the query
             
-        Time Complexity: O(n) where n is number of unique titles
+        Time Complexity: O(c) where c is the number of titles sharing the
+        query's rarest trigram; O(n) over unique titles for 1-2 character queries
         """
-        query_lower = query.lower().strip()
+        results = []
+        for title_key in self._match_title_keys(query.lower().strip()):
+            results.extend(self.songs_by_title[title_key])
+        
+        return results
+    
+    def _match_title_keys(self, query_lower: str) -> List[str]:
+        """Find the title keys containing an already normalized query."""
         if not query_lower:
             return []
         
-        results = []
-        for title_key, songs in self.songs_by_title.items():
-            if query_lower in title_key:
-                results.extend(songs)
+        if len(query_lower) >= 3:
+            if self._title_trigrams is None:
+                self._title_trigrams = self._build_trigram_index(self.songs_by_title)
+            return self._trigram_search(self._title_trigrams, query_lower)
         
-        return results
+        if self._title_search_index is None:
+            self._title_search_index = self._build_search_index(self.songs_by_title)
+        return self._scan_search_index(self._title_search_index, query_lower)
     
     def fuzzy_search_artist(self, query: str) -> List[Song]:
         """
@@ -149,18 +177,116 @@ class SongLookup:
         Returns:
             List[Song]: Songs by artists containing the query
             
-        Time Complexity: O(n) where n is number of unique artists
+        Time Complexity: O(c) where c is the number of artists sharing the
+        query's rarest trigram; O(n) over unique artists for 1-2 character queries
         """
-        query_lower = query.lower().strip()
+        results = []
+        for artist_key in self._match_artist_keys(query.lower().strip()):
+            results.extend(self.songs_by_artist[artist_key])
+        
+        return results
+    
+    def _match_artist_keys(self, query_lower: str) -> List[str]:
+        """Find the artist keys containing an already normalized query."""
         if not query_lower:
             return []
         
-        results = []
-        for artist_key, songs in self.songs_by_artist.items():
-            if query_lower in artist_key:
-                results.extend(songs)
+        if len(query_lower) >= 3:
+            if self._artist_trigrams is None:
+                self._artist_trigrams = self._build_trigram_index(self.songs_by_artist)
+            return self._trigram_search(self._artist_trigrams, query_lower)
         
-        return results
+        if self._artist_search_index is None:
+            self._artist_search_index = self._build_search_index(self.songs_by_artist)
+        return self._scan_search_index(self._artist_search_index, query_lower)
+    
+    @classmethod
+    def _build_trigram_index(cls, table: Dict[str, List[Song]]) -> Dict[str, Dict[str, None]]:
+        """Build trigram posting lists for every key of a lookup table."""
+        postings: Dict[str, Dict[str, None]] = {}
+        for key in table:
+            cls._index_trigrams(postings, key)
+        return postings
+    
+    @staticmethod
+    def _index_trigrams(postings: Dict[str, Dict[str, None]], key: str) -> None:
+        """Add a key to the posting list of each trigram it contains."""
+        for i in range(len(key) - 2):
+            trigram = key[i:i + 3]
+            posting = postings.get(trigram)
+            if posting is None:
+                postings[trigram] = {key: None}
+            else:
+                posting[key] = None
+    
+    @staticmethod
+    def _unindex_trigrams(postings: Dict[str, Dict[str, None]], key: str) -> None:
+        """Remove a key from the posting lists of its trigrams."""
+        for i in range(len(key) - 2):
+            trigram = key[i:i + 3]
+            posting = postings.get(trigram)
+            if posting is not None:
+                posting.pop(key, None)
+                if not posting:
+                    del postings[trigram]
+    
+    @staticmethod
+    def _trigram_search(postings: Dict[str, Dict[str, None]], query: str) -> List[str]:
+        """
+        Find every key containing a query of at least three characters.
+        
+        Candidates come from the shortest posting list among the query's
+        trigrams, filtered by the others and confirmed with a substring check.
+        """
+        query_postings = []
+        for trigram in {query[i:i + 3] for i in range(len(query) - 2)}:
+            posting = postings.get(trigram)
+            if posting is None:
+                return []
+            query_postings.append(posting)
+        
+        query_postings.sort(key=len)
+        candidates, others = query_postings[0], query_postings[1:]
+        return [
+            key for key in candidates
+            if all(key in posting for posting in others) and query in key
+        ]
+    
+    @staticmethod
+    def _build_search_index(table: Dict[str, List[Song]]) -> Tuple[str, List[int], List[str]]:
+        """Join the keys of a lookup table into one newline-separated string."""
+        keys = list(table.keys())
+        starts = []
+        position = 0
+        for key in keys:
+            starts.append(position)
+            position += len(key) + 1
+        return "\n".join(keys), starts, keys
+    
+    @staticmethod
+    def _scan_search_index(index: Tuple[str, List[int], List[str]], query: str) -> List[str]:
+        """
+        Find every key containing the query using str.find over the joined keys.
+        
+        Only matching keys cost a Python-level iteration; non-matching keys
+        are skipped inside str.find.
+        """
+        blob, starts, keys = index
+        if "\n" in query:
+            # A match could straddle the separator, so check keys one by one
+            return [key for key in keys if query in key]
+        
+        matches = []
+        position = blob.find(query)
+        while position != -1:
+            key_index = bisect_right(starts, position) - 1
+            matches.append(keys[key_index])
+            # Resume at the next key so each key is reported once
+            if key_index + 1 == len(starts):
+                break
+            position = blob.find(query, starts[key_index + 1])
+        
+        return matches
     
     def search_by_partial_info(self, title_query: Optional[str] = None, 
                               artist_query: Optional[str] = None) -> List[Song]:
@@ -174,22 +300,34 @@ class SongLookup:
         Returns:
             List[Song]: Songs matching the criteria
         """
-        title_results = set()
-        artist_results = set()
-        
-        if title_query:
-            title_results = set(self.fuzzy_search_title(title_query))
-        
-        if artist_query:
-            artist_results = set(self.fuzzy_search_artist(artist_query))
-        
         if title_query and artist_query:
-            # Both criteria must match (intersection)
-            return list(title_results & artist_results)
+            # Both criteria must match: expand only the side with fewer
+            # matching songs and filter it by the other query, instead of
+            # materializing both result sets and intersecting them
+            title_lower = title_query.lower().strip()
+            artist_lower = artist_query.lower().strip()
+            title_keys = self._match_title_keys(title_lower)
+            artist_keys = self._match_artist_keys(artist_lower)
+            if not title_keys or not artist_keys:
+                return []
+            
+            title_count = sum(len(self.songs_by_title[key]) for key in title_keys)
+            artist_count = sum(len(self.songs_by_artist[key]) for key in artist_keys)
+            if title_count <= artist_count:
+                return [
+                    song for key in title_keys
+                    for song in self.songs_by_title[key]
+                    if artist_lower in song.artist_key
+                ]
+            return [
+                song for key in artist_keys
+                for song in self.songs_by_artist[key]
+                if title_lower in song.title_key
+            ]
         elif title_query:
-            return list(title_results)
+            return self.fuzzy_search_title(title_query)
         elif artist_query:
-            return list(artist_results)
+            return self.fuzzy_search_artist(artist_query)
         else:
             return []
     
@@ -210,35 +348,39 @@ class SongLookup:
         
         # Remove from primary lookup
         del self.songs_by_id[song.id]
+        self.revision += 1
         
         # Remove from secondary lookups
         self._remove_from_title_lookup(song)
         self._remove_from_artist_lookup(song)
         
-        # Remove from set
-        self.all_songs.discard(song)
-        
         return True
     
     def _remove_from_title_lookup(self, song: Song) -> None:
         """Remove song from title lookup table."""
-        title_key = song.title.lower().strip()
+        title_key = song.title_key
         if title_key in self.songs_by_title:
             try:
                 self.songs_by_title[title_key].remove(song)
                 if not self.songs_by_title[title_key]:
                     del self.songs_by_title[title_key]
+                    self._title_search_index = None
+                    if self._title_trigrams is not None:
+                        self._unindex_trigrams(self._title_trigrams, title_key)
             except ValueError:
                 pass  # Song not in list
     
     def _remove_from_artist_lookup(self, song: Song) -> None:
         """Remove song from artist lookup table."""
-        artist_key = song.artist.lower().strip()
+        artist_key = song.artist_key
         if artist_key in self.songs_by_artist:
             try:
                 self.songs_by_artist[artist_key].remove(song)
                 if not self.songs_by_artist[artist_key]:
                     del self.songs_by_artist[artist_key]
+                    self._artist_search_index = None
+                    if self._artist_trigrams is not None:
+                        self._unindex_trigrams(self._artist_trigrams, artist_key)
             except ValueError:
                 pass  # Song not in list
     
@@ -264,9 +406,40 @@ class SongLookup:
         # Add new version
         return self.add_song(song)
     
-    def get_all_songs(self) -> List[Song]:
-        """Get all songs in the lookup system."""
-        return list(self.all_songs)
+    def iter_songs(self) -> Iterable[Song]:
+        """
+        Iterate over all songs in insertion order without copying them.
+        
+        Songs must not be added or removed while iterating.
+        """
+        return self.songs_by_id.values()
+    
+    def mark_song_changed(self, song_id: str) -> None:
+        """
+        Record that a held song's fields changed, so caches built over the
+        library see a new revision. Title and artist changes still need the
+        song to be removed and re-added to update the lookup keys.
+        """
+        if song_id in self.songs_by_id:
+            self.revision += 1
+    
+    def get_all_songs(self, offset: int = 0, limit: Optional[int] = None) -> List[Song]:
+        """
+        Get songs in the lookup system, optionally a single page of them.
+        
+        Args:
+            offset: Number of songs to skip
+            limit: Maximum number of songs to return (all if None)
+            
+        Returns:
+            List[Song]: Songs in insertion order
+            
+        Time Complexity: O(offset + limit), O(n) when limit is None
+        """
+        if offset == 0 and limit is None:
+            return list(self.songs_by_id.values())
+        stop = offset + limit if limit is not None else None
+        return list(islice(self.songs_by_id.values(), offset, stop))
     
     def get_all_titles(self) -> List[str]:
         """Get all unique song titles."""
@@ -285,7 +458,11 @@ class SongLookup:
         self.songs_by_id.clear()
         self.songs_by_title.clear()
         self.songs_by_artist.clear()
-        self.all_songs.clear()
+        self._title_search_index = None
+        self._artist_search_index = None
+        self._title_trigrams = None
+        self._artist_trigrams = None
+        self.revision += 1
     
     def get_stats(self) -> Dict[str, int]:
         """Get statistics about the lookup system."""
@@ -1,37 +1,41 @@
 """
-Song Rating Tree using Binary Search Tree implementation
+Song Rating Tree using rating-indexed buckets
 Organizes songs by rating for fast rating-based queries
 """
 
+from itertools import islice
 from typing import List, Optional, Dict
 from models.song import Song
 
-class RatingNode:
-    """Node for BST storing songs grouped by rating"""
-    
-    def __init__(self, rating: int):
-        self.rating = rating
-        self.songs: List[Song] = []  # Multiple songs can have same rating
-        self.left: Optional['RatingNode'] = None
-        self.right: Optional['RatingNode'] = None
+MIN_RATING = 0
+MAX_RATING = 5
 
 class SongRatingTree:
     """
-    Binary Search Tree for organizing songs by rating.
-    Each node contains all songs with a specific rating.
+    Rating index for organizing songs by rating.
+    
+    Ratings are bounded to 0-5, so instead of a binary search tree with one
+    node per rating, songs live in a fixed array of six buckets indexed
+    directly by rating. Each bucket maps song IDs to all songs with that
+    rating, in insertion order.
     
     Time Complexity:
-    - Insert: O(log n) average, O(n) worst case
-    - Search: O(log n) average, O(n) worst case  
-    - Delete: O(log n) average, O(n) worst case
-    - Range query: O(log n + k) where k is result size
+    - Insert: O(1)
+    - Search: O(k) to copy the k matching songs
+    - Delete: O(1)
+    - Range query: O(k) where k is result size
     
-    Space Complexity: O(n) where n is number of unique ratings (max 6: 0-5)
+    Space Complexity: O(n) where n is number of songs
     """
     
     def __init__(self):
-        self.root: Optional[RatingNode] = None
+        self.buckets: List[Dict[str, Song]] = [{} for _ in range(MAX_RATING + 1)]
+        # song_id -> rating bucket the song was inserted into
+        self.song_ratings: Dict[str, int] = {}
         self.total_songs = 0
+        # Bumped on every insert and delete, and when a held song changes
+        # (see mark_song_changed)
+        self.revision = 0
     
     def insert_song(self, song: Song, rating: Optional[int] = None) -> bool:
         """
@@ -40,46 +44,23 @@ class SongRatingTree:
         Args:
             song: Song object to insert
             rating: Rating to use (uses song.rating if None)
-            
+        
         Returns:
-            bool: True if inserted successfully
-            
-        Time Complexity: O(log n) average
+            bool: True if inserted successfully, False if already present
+        
+        Time Complexity: O(1)
         """
-        target_rating = rating if rating is not None else song.rating
-        target_rating = max(0, min(5, target_rating))  # Ensure valid range
+        if song.id in self.song_ratings:
+            return False  # Song already exists
         
-        if self.root is None:
-            self.root = RatingNode(target_rating)
-            self.root.songs.append(song)
-            self.total_songs += 1
-            return True
+        target_rating = rating if rating is not None else song.rating
+        target_rating = max(MIN_RATING, min(MAX_RATING, target_rating))  # Ensure valid range
         
-        return self._insert_recursive(self.root, song, target_rating)
-    
-    def _insert_recursive(self, node: RatingNode, song: Song, rating: int) -> bool:
-        """Recursive helper for insertion."""
-        if rating == node.rating:
-            # Song with this rating already exists in this node
-            if song not in node.songs:
-                node.songs.append(song)
-                self.total_songs += 1
-                return True
-            return False  # Song already exists
-        elif rating < node.rating:
-            if node.left is None:
-                node.left = RatingNode(rating)
-                node.left.songs.append(song)
-                self.total_songs += 1
-                return True
-            return self._insert_recursive(node.left, song, rating)
-        else:
-            if node.right is None:
-                node.right = RatingNode(rating)
-                node.right.songs.append(song)
-                self.total_songs += 1
-                return True
-            return self._insert_recursive(node.right, song, rating)
+        self.buckets[target_rating][song.id] = song
+        self.song_ratings[song.id] = target_rating
+        self.total_songs += 1
+        self.revision += 1
+        return True
     
     def search_by_rating(self, rating: int) -> List[Song]:
         """
@@ -87,25 +68,14 @@ class SongRatingTree:
         
         Args:
             rating: Rating to search for (0-5)
-            
+        
         Returns:
             List[Song]: Songs with the specified rating
-            
-        Time Complexity: O(log n)
+        
+        Time Complexity: O(k) where k is result size
         """
-        rating = max(0, min(5, rating))  # Ensure valid range
-        node = self._find_node(self.root, rating)
-        return node.songs.copy() if node else []
-    
-    def _find_node(self, node: Optional[RatingNode], rating: int) -> Optional[RatingNode]:
-        """Find node with specific rating."""
-        if node is None or node.rating == rating:
-            return node
-        
-        if rating < node.rating:
-            return self._find_node(node.left, rating)
-        else:
-            return self._find_node(node.right, rating)
+        rating = max(MIN_RATING, min(MAX_RATING, rating))  # Ensure valid range
+        return list(self.buckets[rating].values())
     
     def delete_song(self, song_id: str) -> bool:
         """
@@ -113,35 +83,20 @@ class SongRatingTree:
         
         Args:
             song_id: ID of song to delete
-            
+        
         Returns:
             bool: True if deleted successfully
-            
-        Time Complexity: O(log n * m) where m is avg songs per rating
+        
+        Time Complexity: O(1)
         """
-        return self._delete_song_recursive(self.root, song_id)
-    
-    def _delete_song_recursive(self, node: Optional[RatingNode], song_id: str) -> bool:
-        """Recursive helper for song deletion."""
-        if node is None:
+        rating = self.song_ratings.pop(song_id, None)
+        if rating is None:
             return False
         
-        # Check current node
-        for i, song in enumerate(node.songs):
-            if song.id == song_id:
-                node.songs.pop(i)
-                self.total_songs -= 1
-                
-                # If node becomes empty, we could remove it (complex BST deletion)
-                # For now, keep empty nodes for simplicity
-                return True
-        
-        # Search in subtrees
-        found_left = self._delete_song_recursive(node.left, song_id)
-        if found_left:
-            return True
-        
-        return self._delete_song_recursive(node.right, song_id)
+        del self.buckets[rating][song_id]
+        self.total_songs -= 1
+        self.revision += 1
+        return True
     
     def get_songs_by_rating_range(self, min_rating: int = 0, max_rating: int = 5) -> List[Song]:
         """
@@ -150,95 +105,65 @@ class SongRatingTree:
         Args:
             min_rating: Minimum rating (inclusive)
             max_rating: Maximum rating (inclusive)
-            
+        
         Returns:
             List[Song]: Songs within the rating range
-            
-        Time Complexity: O(log n + k) where k is result size
+        
+        Time Complexity: O(k) where k is result size
         """
-        min_rating = max(0, min(5, min_rating))
-        max_rating = max(0, min(5, max_rating))
+        min_rating = max(MIN_RATING, min(MAX_RATING, min_rating))
+        max_rating = max(MIN_RATING, min(MAX_RATING, max_rating))
         
         if min_rating > max_rating:
             min_rating, max_rating = max_rating, min_rating
         
         result = []
-        self._range_search(self.root, min_rating, max_rating, result)
+        for bucket in self.buckets[min_rating:max_rating + 1]:
+            result.extend(bucket.values())
         return result
     
-    def _range_search(self, node: Optional[RatingNode], min_rating: int, 
-                     max_rating: int, result: List[Song]) -> None:
-        """Recursive helper for range search."""
-        if node is None:
-            return
-        
-        # If current rating is in range, add all songs
-        if min_rating <= node.rating <= max_rating:
-            result.extend(node.songs)
-        
-        # Search left subtree if needed
-        if min_rating < node.rating:
-            self._range_search(node.left, min_rating, max_rating, result)
-        
-        # Search right subtree if needed
-        if max_rating > node.rating:
-            self._range_search(node.right, min_rating, max_rating, result)
-    
     def get_rating_distribution(self) -> Dict[int, int]:
         """
         Get distribution of songs by rating.
         
         Returns:
             Dict[int, int]: Rating -> count mapping
-            
-        Time Complexity: O(n)
-        """
-        distribution = {}
-        self._collect_distribution(self.root, distribution)
-        return distribution
-    
-    def _collect_distribution(self, node: Optional[RatingNode], 
-                            distribution: Dict[int, int]) -> None:
-        """Recursive helper for collecting rating distribution."""
-        if node is None:
-            return
-        
-        if node.songs:  # Only count non-empty nodes
-            distribution[node.rating] = len(node.songs)
         
-        self._collect_distribution(node.left, distribution)
-        self._collect_distribution(node.right, distribution)
+        Time Complexity: O(1)
+        """
+        # Only count non-empty ratings
+        return {
+            rating: len(bucket)
+            for rating, bucket in enumerate(self.buckets)
+            if bucket
+        }
     
     def get_all_songs(self) -> List[Song]:
         """Get all songs from the tree."""
-        result = []
-        self._collect_all_songs(self.root, result)
-        return result
-    
-    def _collect_all_songs(self, node: Optional[RatingNode], result: List[Song]) -> None:
-        """Recursive helper for collecting all songs."""
-        if node is None:
-            return
-        
-        result.extend(node.songs)
-        self._collect_all_songs(node.left, result)
-        self._collect_all_songs(node.right, result)
+        return self.get_songs_by_rating_range(MIN_RATING, MAX_RATING)
     
     def get_top_rated_songs(self, limit: int = 10) -> List[Song]:
         """Get top rated songs (5-star first, then 4-star, etc.)."""
         result = []
-        for rating in range(5, -1, -1):  # 5 down to 0
-            songs = self.search_by_rating(rating)
-            result.extend(songs)
+        for bucket in reversed(self.buckets):  # 5 down to 0
+            result.extend(islice(bucket.values(), max(limit - len(result), 0)))
             if len(result) >= limit:
                 break
         
-        return result[:limit]
+        return result
+    
+    def mark_song_changed(self, song_id: str) -> None:
+        """
+        Record that a held song's fields changed. Rating changes still need
+        the song to be deleted and reinserted to move it between buckets.
+        """
+        if song_id in self.song_ratings:
+            self.revision += 1
     
     def is_empty(self) -> bool:
         """Check if tree is empty."""
-        return self.root is None
+        return self.total_songs == 0
     
     def get_song_count(self) -> int:
         """Get total number of songs in tree."""
-        return self.total_songs
\ No newline at end of file
+        return self.total_songs
@@ -3,16 +3,46 @@ System Snapshot Module for real-time analytics and insights
 Generates comprehensive system statistics by integrating all components
 """
 
+import csv
+import heapq
+import json
+import time
+from bisect import bisect_right
+from collections import Counter
+from functools import partial
+from operator import attrgetter
 from typing import Dict, List, Any, Optional
 from datetime import datetime
-from models.song import Song
+
+# Upper bounds (in seconds) of the duration distribution buckets; a song
+# falls into the bucket at index bisect_right(DURATION_BOUNDS, duration)
+DURATION_BOUNDS = (120, 180, 240, 300, 360)
+DURATION_LABELS = ('0-2min', '2-3min', '3-4min', '4-5min', '5-6min', '6min+')
+_duration_bucket = partial(bisect_right, DURATION_BOUNDS)
+
+def _copy_data(value: Any) -> Any:
+    """Copy nested dicts and lists of snapshot data; leaves are immutable."""
+    if type(value) is dict:
+        return {key: _copy_data(item) for key, item in value.items()}
+    if type(value) is list:
+        return [_copy_data(item) for item in value]
+    return value
+
+# Compact encoding with the same settings as FastAPI's JSONResponse
+_to_json = partial(json.dumps, ensure_ascii=False, separators=(',', ':'))
 
 class SystemSnapshot:
     """
     Real-time system analytics and insights generator.
     Combines data from all system components for comprehensive reporting.
     
-    Time Complexity: O(n log n) due to sorting operations
+    Each song section of a snapshot is cached together with the revision
+    counters of the components it reads, and is only recomputed once one of
+    them has changed. Components learn about edits to the songs they hold
+    through mark_song_changed, which PlayWiseEngine calls from its song
+    mutators; code changing songs elsewhere must call it too.
+    
+    Time Complexity: O(n) for sections whose inputs changed, O(1) otherwise
     Space Complexity: O(n) for snapshot data
     """
     
@@ -24,10 +54,19 @@ class SystemSnapshot:
         self.song_lookup = song_lookup
         self.favorites_queue = favorites_queue
         
-        # Snapshot cache
+        # Snapshot cache: section name -> (revision key, section data)
+        self._section_cache: Dict[str, tuple] = {}
+        # Section name -> (section data, its JSON encoding), reused by
+        # generate_snapshot_json while the cached section object is unchanged
+        self._section_json: Dict[str, tuple] = {}
+        # Sections served from / recomputed into the cache, reported in
+        # system_health so the hit rate can be checked
+        self.section_cache_hits = 0
+        self.section_cache_misses = 0
         self.last_snapshot = None
         self.last_snapshot_time = None
-        self.cache_duration = 60  # Cache for 60 seconds
+        # time.monotonic() of the last snapshot, for computing the cache age
+        self._last_snapshot_monotonic: Optional[float] = None
     
     def set_components(self, playlist_engine=None, playback_history=None,
                       song_rating_tree=None, song_lookup=None, favorites_queue=None):
@@ -42,62 +81,139 @@ class SystemSnapshot:
             self.song_lookup = song_lookup
         if favorites_queue:
             self.favorites_queue = favorites_queue
+        self._section_cache.clear()
+        self._section_json.clear()
     
     def generate_snapshot(self, use_cache: bool = True) -> Dict[str, Any]:
         """
         Generate a comprehensive system snapshot.
         
         Args:
-            use_cache: Whether to use cached snapshot if available
+            use_cache: Whether to reuse cached sections whose inputs are unchanged
             
         Returns:
-            Dict: Comprehensive system statistics
+            Dict: Comprehensive system statistics. This is a copy, so callers
+            may modify it without affecting the section cache.
             
-        Time Complexity: O(n log n)
+        Time Complexity: O(n) for each section whose inputs changed, plus a
+        copy of the snapshot, whose size does not grow with the library
+        """
+        snapshot = _copy_data(self._build_snapshot(use_cache))
+        self.last_snapshot = snapshot
+        return snapshot
+    
+    def _build_snapshot(self, use_cache: bool) -> Dict[str, Any]:
+        """
+        Assemble a snapshot whose cached sections are shared with the section
+        cache; the result must not be modified.
         """
         current_time = datetime.now()
+        now_monotonic = time.monotonic()
+        if not use_cache:
+            self._section_cache.clear()
+        
+        history = self._revision(self.playback_history)
+        ratings = self._revision(self.song_rating_tree)
+        lookup = self._revision(self.song_lookup)
+        favorites = self._revision(self.favorites_queue)
+        
+        # Each component bumps its revision when its membership changes or a
+        # song it holds is modified, so a section only depends on the
+        # revisions of the components it reads
+        sections = [
+            ('song_analytics', self._get_song_analytics, (lookup,)),
+            ('playback_insights', self._get_playback_insights, (history,)),
+            ('rating_analysis', self._get_rating_analysis, (ratings,)),
+            ('favorites_summary', self._get_favorites_summary, (favorites,)),
+            ('top_performers', self._get_top_performers,
+             (history, ratings, lookup, favorites)),
+        ]
         
-        # Check cache validity
-        if (use_cache and self.last_snapshot and self.last_snapshot_time and
-            (current_time - self.last_snapshot_time).seconds < self.cache_duration):
-            return self.last_snapshot.copy()
-        
+        # The playlist sections take O(1) per playlist, and playlists can be
+        # edited or renamed directly, so they are rebuilt every time
         snapshot = {
             'timestamp': current_time.isoformat(),
             'system_overview': self._get_system_overview(),
-            'playlist_statistics': self._get_playlist_statistics(),
-            'song_analytics': self._get_song_analytics(),
-            'playback_insights': self._get_playback_insights(),
-            'rating_analysis': self._get_rating_analysis(),
-            'favorites_summary': self._get_favorites_summary(),
-            'top_performers': self._get_top_performers(),
-            'system_health': self._get_system_health()
+            'playlist_statistics': self._get_playlist_statistics()
         }
+        for name, compute, key in sections:
+            cached = self._section_cache.get(name)
+            if cached is None or cached[0] != key:
+                cached = (key, compute())
+                self._section_cache[name] = cached
+                self.section_cache_misses += 1
+            else:
+                self.section_cache_hits += 1
+            snapshot[name] = cached[1]
+        
+        # Health reports the cache age, so it is never cached itself
+        snapshot['system_health'] = self._get_system_health(now_monotonic)
         
-        # Cache the snapshot
-        self.last_snapshot = snapshot.copy()
         self.last_snapshot_time = current_time
+        self._last_snapshot_monotonic = now_monotonic
         
         return snapshot
     
+    def generate_snapshot_json(self, use_cache: bool = True) -> str:
+        """
+        Generate a system snapshot encoded as a compact JSON object.
+        
+        Sections served from the cache reuse their previous encoding, so only
+        the timestamp, health and recomputed sections are serialized.
+        
+        Args:
+            use_cache: Whether to reuse cached sections whose inputs are unchanged
+            
+        Returns:
+            str: JSON text of the snapshot, with keys in generate_snapshot order
+            
+        Time Complexity: O(n) for each section whose inputs changed
+        """
+        snapshot = self._build_snapshot(use_cache)
+        section_json = self._section_json
+        
+        fields = []
+        for name, value in snapshot.items():
+            cached = section_json.get(name)
+            if cached is not None and cached[0] is value:
+                encoded = cached[1]
+            else:
+                encoded = _to_json(value)
+                if name in self._section_cache:
+                    section_json[name] = (value, encoded)
+            fields.append(f'{_to_json(name)}:{encoded}')
+        
+        return '{' + ','.join(fields) + '}'
+    
+    @staticmethod
+    def _revision(component) -> Optional[int]:
+        """Get a component's revision counter, or None if it is not set."""
+        return component.revision if component is not None else None
+    
     def _get_system_overview(self) -> Dict[str, Any]:
         """Get high-level system overview."""
         total_songs = 0
         total_playlists = 0
         
+        unique_artists = 0
+        unique_titles = 0
+        
         if self.playlist_engine:
             total_playlists = len(self.playlist_engine.playlists)
-            total_songs = sum(len(playlist.songs) for playlist in self.playlist_engine.playlists.values())
+            total_songs = sum(map(len, self.playlist_engine.iter_playlists()))
         
         if self.song_lookup:
-            lookup_songs = self.song_lookup.get_song_count()
-            total_songs = max(total_songs, lookup_songs)
+            # Counts come straight from the lookup tables, without listing keys
+            lookup_stats = self.song_lookup.get_stats()
+            total_songs = max(total_songs, lookup_stats['total_songs'])
+            unique_artists = lookup_stats['unique_artists']
+            unique_titles = lookup_stats['unique_titles']
         
         return {
             'total_songs': total_songs,
             'total_playlists': total_playlists,
-            'total_unique_artists': len(self.song_lookup.get_all_artists()) if self.song_lookup else 0,
-            'total_unique_titles': len(self.song_lookup.get_all_titles()) if self.song_lookup else 0,
+            'total_unique_artists': unique_artists,
+            'total_unique_titles': unique_titles,
             'system_components_active': self._count_active_components()
         }
     
@@ -116,27 +232,29 @@ class SystemSnapshot:
                 'smallest_playlist': None
             }
         
-        # Calculate statistics
-        song_counts = [len(playlist.songs) for playlist in playlists]
+        # Calculate statistics; each playlist's count and duration is read
+        # once, and the extremes are found by index instead of re-reading them
+        song_counts = list(map(len, playlists))
         durations = [playlist.get_total_duration() for playlist in playlists]
+        total_duration = sum(durations)
         
-        largest_playlist = max(playlists, key=lambda p: len(p.songs))
-        smallest_playlist = min(playlists, key=lambda p: len(p.songs))
+        largest = max(range(len(playlists)), key=song_counts.__getitem__)
+        smallest = min(range(len(playlists)), key=song_counts.__getitem__)
         
         return {
             'total_playlists': len(playlists),
             'average_songs_per_playlist': sum(song_counts) / len(song_counts),
-            'total_duration_minutes': sum(durations) / 60,
-            'average_duration_minutes': (sum(durations) / len(durations)) / 60,
+            'total_duration_minutes': total_duration / 60,
+            'average_duration_minutes': (total_duration / len(durations)) / 60,
             'largest_playlist': {
-                'name': largest_playlist.name,
-                'songs': len(largest_playlist.songs),
-                'duration_minutes': largest_playlist.get_total_duration() / 60
+                'name': playlists[largest].name,
+                'songs': song_counts[largest],
+                'duration_minutes': durations[largest] / 60
             },
             'smallest_playlist': {
-                'name': smallest_playlist.name,
-                'songs': len(smallest_playlist.songs),
-                'duration_minutes': smallest_playlist.get_total_duration() / 60
+                'name': playlists[smallest].name,
+                'songs': song_counts[smallest],
+                'duration_minutes': durations[smallest] / 60
             }
         }
     
@@ -145,7 +263,8 @@ class SystemSnapshot:
         if not self.song_lookup:
             return {'error': 'Song lookup not available'}
         
-        all_songs = self.song_lookup.get_all_songs()
+        # A live view of the library; each pass below iterates it directly
+        all_songs = self.song_lookup.iter_songs()
         if not all_songs:
             return {
                 'total_songs': 0,
@@ -156,35 +275,24 @@ class SystemSnapshot:
             }
         
         # Duration analysis
-        durations = [song.duration for song in all_songs]
+        get_duration = attrgetter('duration')
+        durations = list(map(get_duration, all_songs))
         average_duration = sum(durations) / len(durations)
         
-        # Top longest and shortest songs
-        sorted_by_duration = sorted(all_songs, key=lambda s: s.duration, reverse=True)
-        top_longest = [song.to_dict() for song in sorted_by_duration[:5]]
-        top_shortest = [song.to_dict() for song in sorted_by_duration[-5:]]
+        # Top longest and shortest songs, selected without sorting the library;
+        # the shortest are listed longest first, as in a descending sort
+        top_longest = [song.to_dict() for song in heapq.nlargest(5, all_songs, key=get_duration)]
+        shortest = heapq.nsmallest(5, all_songs, key=get_duration)
+        top_shortest = [song.to_dict() for song in reversed(shortest)]
         
-        # Duration distribution
+        # Duration distribution: bucket each duration with a binary search
+        # over the bucket bounds, counted in C by Counter
+        bucket_counts = Counter(map(_duration_bucket, durations))
         duration_ranges = {
-            '0-2min': 0, '2-3min': 0, '3-4min': 0, 
-            '4-5min': 0, '5-6min': 0, '6min+': 0
+            label: bucket_counts[index]
+            for index, label in enumerate(DURATION_LABELS)
         }
         
-        for duration in durations:
-            minutes = duration / 60
-            if minutes < 2:
-                duration_ranges['0-2min'] += 1
-            elif minutes < 3:
-                duration_ranges['2-3min'] += 1
-            elif minutes < 4:
-                duration_ranges['3-4min'] += 1
-            elif minutes < 5:
-                duration_ranges['4-5min'] += 1
-            elif minutes < 6:
-                duration_ranges['5-6min'] += 1
-            else:
-                duration_ranges['6min+'] += 1
-        
         return {
             'total_songs': len(all_songs),
             'average_duration_seconds': average_duration,
@@ -199,8 +307,7 @@ class SystemSnapshot:
         if not self.playback_history:
             return {'error': 'Playback history not available'}
         
-        recent_history = self.playback_history.get_recent_history(50)
-        if not recent_history:
+        if self.playback_history.is_empty():
             return {
                 'total_plays': 0,
                 'recently_played': [],
@@ -210,7 +317,7 @@ class SystemSnapshot:
         
         return {
             'total_plays': self.playback_history.get_history_size(),
-            'recently_played': [song.to_dict() for song in recent_history[:10]],
+            'recently_played': [song.to_dict() for song in self.playback_history.iter_recent(10)],
             'most_played_songs': [song.to_dict() for song in self.playback_history.get_most_played_songs(5)],
             'recently_played_artists': self.playback_history.get_recently_played_artists(10)
         }
@@ -286,8 +393,8 @@ class SystemSnapshot:
         
         # Longest songs
         if self.song_lookup:
-            all_songs = self.song_lookup.get_all_songs()
-            longest_songs = sorted(all_songs, key=lambda s: s.duration, reverse=True)[:5]
+            longest_songs = heapq.nlargest(5, self.song_lookup.iter_songs(),
+                                           key=attrgetter('duration'))
             performers['longest_songs'] = [song.to_dict() for song in longest_songs]
         
         # Top favorites
@@ -297,8 +404,16 @@ class SystemSnapshot:
         
         return performers
     
-    def _get_system_health(self) -> Dict[str, Any]:
-        """Get system health and performance metrics."""
+    def _get_system_health(self, now_monotonic: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Get system health and performance metrics.
+        
+        Args:
+            now_monotonic: time.monotonic() reading to measure the cache age
+                against (read here if None)
+        """
+        if now_monotonic is None:
+            now_monotonic = time.monotonic()
         health = {
             'components_status': {
                 'playlist_engine': self.playlist_engine is not None,
@@ -309,11 +424,13 @@ class SystemSnapshot:
             },
             'data_consistency': self._check_data_consistency(),
             'cache_status': {
-                'last_snapshot_cached': self.last_snapshot is not None,
+                'last_snapshot_cached': self.last_snapshot_time is not None,
                 'cache_age_seconds': (
-                    (datetime.now() - self.last_snapshot_time).seconds
-                    if self.last_snapshot_time else None
-                )
+                    int(now_monotonic - self._last_snapshot_monotonic)
+                    if self._last_snapshot_monotonic is not None else None
+                ),
+                'section_hits': self.section_cache_hits,
+                'section_misses': self.section_cache_misses
             }
         }
         
@@ -362,11 +479,11 @@ class SystemSnapshot:
             snapshot = self.generate_snapshot()
             
             if format == 'json':
-                import json
+                # Encode in one call and write once; json.dump would issue a
+                # separate write for every encoded chunk
                 with open(filepath, 'w') as f:
-                    json.dump(snapshot, f, indent=2, default=str)
+                    f.write(json.dumps(snapshot, indent=2, default=str))
             elif format == 'csv':
-                import csv
                 # Flatten the snapshot for CSV export
                 flat_data = self._flatten_snapshot(snapshot)
                 with open(filepath, 'w', newline='') as f:
@@ -380,23 +497,41 @@ class SystemSnapshot:
             return False
     
     def _flatten_snapshot(self, snapshot: Dict[str, Any], prefix: str = '') -> Dict[str, Any]:
-        """Flatten nested dictionary for CSV export."""
-        flat_dict = {}
+        """
+        Flatten nested dictionary for CSV export.
         
-        for key, value in snapshot.items():
-            new_key = f"{prefix}{key}" if prefix else key
-            
-            if isinstance(value, dict):
-                flat_dict.update(self._flatten_snapshot(value, f"{new_key}_"))
-            elif isinstance(value, list) and value and isinstance(value[0], dict):
-                # For lists of dictionaries, just take the count
-                flat_dict[f"{new_key}_count"] = len(value)
+        Nested dictionaries are walked with an explicit stack of item
+        iterators, which keeps the keys in the same order as a recursive walk.
+        """
+        flat_dict = {}
+        stack = [(prefix, iter(snapshot.items()))]
+        
+        while stack:
+            prefix, items = stack[-1]
+            for key, value in items:
+                new_key = f"{prefix}{key}"
+                
+                if isinstance(value, dict):
+                    # Descend now; this level resumes once the child is done
+                    stack.append((f"{new_key}_", iter(value.items())))
+                    break
+                elif isinstance(value, list) and value and isinstance(value[0], dict):
+                    # For lists of dictionaries, just take the count
+                    flat_dict[f"{new_key}_count"] = len(value)
+                elif isinstance(value, (int, float)):
+                    # csv writes numbers the same way str() would
+                    flat_dict[new_key] = value
+                else:
+                    flat_dict[new_key] = str(value)
             else:
-                flat_dict[new_key] = str(value)
+                stack.pop()
         
         return flat_dict
     
     def clear_cache(self) -> None:
         """Clear the snapshot cache."""
+        self._section_cache.clear()
+        self._section_json.clear()
         self.last_snapshot = None
-        self.last_snapshot_time = None
\ No newline at end of file
+        self.last_snapshot_time = None
+        self._last_snapshot_monotonic = None
\ No newline at end of file
@@ -117,8 +117,16 @@ def run_demo():
     print("\n🎉 Demo completed! All features working correctly.")
     return engine
 
-def run_api_server(host: str = "0.0.0.0", port: int = 8000, reload: bool = True):
-    """Run the FastAPI server."""
+def run_api_server(host: str = "0.0.0.0", port: int = 8000, reload: bool = True,
+                   workers: int = 1):
+    """
+    Run the FastAPI server.
+    
+    Runs on uvloop and httptools, both installed by uvicorn[standard].
+    Each worker process holds its own engine state, so more than one
+    worker is only suitable once state is shared outside the process.
+    Auto-reload always runs a single worker.
+    """
     
     print("🚀 Starting PlayWise API server...")
     print(f"📡 Server will be available at: http://{host}:{port}")
@@ -132,6 +140,9 @@ def run_api_server(host: str = "0.0.0.0", port: int = 8000, reload: bool = True)
             host=host,
             port=port,
             reload=reload,
+            workers=1 if reload else workers,
+            loop="uvloop",
+            http="httptools",
             log_level="info"
         )
     except KeyboardInterrupt:
@@ -152,6 +163,7 @@ def show_help():
     print("  --host HOST   Host to bind to (default: 0.0.0.0)")
     print("  --port PORT   Port to bind to (default: 8000)")
     print("  --no-reload   Disable auto-reload in development")
+    print("  --workers N   Worker processes, each with its own engine state (default: 1)")
     print("\nExamples:")
     print("  python main.py demo")
     print("  python main.py api")
@@ -193,6 +205,13 @@ def main():
         help="Disable auto-reload for API server"
     )
     
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of API worker processes; each keeps its own engine state (default: 1)"
+    )
+    
     args = parser.parse_args()
     
     if args.command == "help":
@@ -203,7 +222,8 @@ def main():
         run_api_server(
             host=args.host,
             port=args.port,
-            reload=not args.no_reload
+            reload=not args.no_reload,
+            workers=args.workers
         )
     else:
         print(f"Unknown command: {args.command}")
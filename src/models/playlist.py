@@ -4,7 +4,7 @@ Playlist model for managing collections of songs
 
 import uuid
 from datetime import datetime
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
 from .song import Song
 
 class Playlist:
@@ -13,7 +13,12 @@ class Playlist:
     
     Time Complexity: 
     - Add/Remove song: O(1) for append, O(n) for specific position
-    - Search: O(n)
+    - Find song by ID: O(1) average via an index, rebuilt in O(n) on the
+      first lookup after a mutation that shifts positions
+    
+    Songs must be changed only through these methods (or replace_songs); the
+    songs list is exposed for reading, and the cached index and total
+    duration rely on seeing every change.
     - Access by index: O(1)
     
     Space Complexity: O(n) where n is the number of songs
@@ -24,6 +29,14 @@ class Playlist:
         self.name = name
         self.description = description
         self.songs: List[Song] = []
+        # song_id -> first index in songs, kept current by appends; None
+        # after a mutation that shifts positions, until the next lookup
+        self._index_cache: Optional[Dict[str, int]] = None
+        # (Song.duration_revision, song count, total) from the last
+        # get_total_duration call; the count only notices songs appended to or
+        # removed from the list directly, so replacing songs in place must go
+        # through replace_songs
+        self._duration_cache: Optional[Tuple[int, int, int]] = None
         self.created_at = datetime.now()
         self.updated_at = datetime.now()
     
@@ -52,13 +65,29 @@ class Playlist:
         try:
             if position == -1 or position >= len(self.songs):
                 self.songs.append(song)
+                if self._index_cache is not None:
+                    self._index_cache.setdefault(song.id, len(self.songs) - 1)
             else:
                 self.songs.insert(max(0, position), song)
+                self._index_cache = None
+            self._adjust_total_duration(1, song.duration)
             self.updated_at = datetime.now()
             return True
         except Exception:
             return False
     
+    def append_song(self, song: Song) -> None:
+        """
+        Add a song to the end of the playlist.
+        
+        Time Complexity: O(1)
+        """
+        self.songs.append(song)
+        if self._index_cache is not None:
+            self._index_cache.setdefault(song.id, len(self.songs) - 1)
+        self._adjust_total_duration(1, song.duration)
+        self.updated_at = datetime.now()
+    
     def remove_song(self, index: int) -> Optional[Song]:
         """
         Remove a song at the specified index.
@@ -73,6 +102,8 @@ class Playlist:
         """
         if 0 <= index < len(self.songs):
             removed_song = self.songs.pop(index)
+            self._index_cache = None
+            self._adjust_total_duration(-1, -removed_song.duration)
             self.updated_at = datetime.now()
             return removed_song
         return None
@@ -93,6 +124,7 @@ class Playlist:
         if 0 <= from_index < len(self.songs) and 0 <= to_index < len(self.songs):
             song = self.songs.pop(from_index)
             self.songs.insert(to_index, song)
+            self._index_cache = None
             self.updated_at = datetime.now()
             return True
         return False
@@ -104,18 +136,76 @@ class Playlist:
         Time Complexity: O(n)
         """
         self.songs.reverse()
+        self._index_cache = None
+        self.updated_at = datetime.now()
+    
+    def clear(self) -> None:
+        """Remove all songs from the playlist."""
+        self.songs.clear()
+        self._index_cache = None
+        self._duration_cache = (Song.duration_revision, 0, 0)
+        self.updated_at = datetime.now()
+    
+    def replace_songs(self, songs: List[Song]) -> None:
+        """
+        Replace the playlist's contents with the given songs in one step.
+        
+        The songs list object itself is kept, so references to it stay live.
+        
+        Time Complexity: O(n)
+        """
+        self.songs[:] = songs
+        self._index_cache = None
+        self._duration_cache = None
         self.updated_at = datetime.now()
     
     def get_total_duration(self) -> int:
-        """Get total duration of all songs in seconds."""
-        return sum(song.duration for song in self.songs)
+        """
+        Get total duration of all songs in seconds.
+        
+        Time Complexity: O(1) unless a song duration changed since the last
+        call, O(n) otherwise
+        """
+        revision = Song.duration_revision
+        songs = self.songs
+        cached = self._duration_cache
+        if cached is not None and cached[0] == revision and cached[1] == len(songs):
+            return cached[2]
+        
+        total = sum(song.duration for song in songs)
+        self._duration_cache = (revision, len(songs), total)
+        return total
+    
+    def _adjust_total_duration(self, count_delta: int, duration_delta: int) -> None:
+        """
+        Apply a song being added or removed to the cached total duration.
+        
+        A total cached under an older Song.duration_revision or song count
+        stays stale and is still recomputed by the next get_total_duration
+        call.
+        """
+        cached = self._duration_cache
+        if cached is not None:
+            self._duration_cache = (cached[0], cached[1] + count_delta,
+                                    cached[2] + duration_delta)
     
     def find_song_by_id(self, song_id: str) -> Optional[int]:
-        """Find song index by ID."""
-        for i, song in enumerate(self.songs):
-            if song.id == song_id:
-                return i
-        return None
+        """
+        Find song index by ID.
+        
+        Time Complexity: O(1) average, including for IDs not in the playlist;
+        O(n) for the first lookup after an insert, removal or reorder, which
+        rebuilds the index
+        """
+        index_cache = self._index_cache
+        if index_cache is None:
+            # Rebuild, keeping the first position of songs listed more than once
+            songs = self.songs
+            index_cache = {}
+            for i in range(len(songs) - 1, -1, -1):
+                index_cache[songs[i].id] = i
+            self._index_cache = index_cache
+        return index_cache.get(song_id)
     
     def get_songs_by_rating(self, min_rating: int = 0, max_rating: int = 5) -> List[Song]:
         """Get songs within a rating range."""
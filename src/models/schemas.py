@@ -22,6 +22,18 @@ class SortCriteria(str, Enum):
     DATE_ADDED = "date_added"
     PLAY_COUNT = "play_count"
 
+class DuplicateStrategy(str, Enum):
+    """Supported duplicate detection strategies"""
+    TITLE_ARTIST = "title_artist"
+    TITLE_ARTIST_DURATION = "title_artist_duration"
+    TITLE_ONLY = "title_only"
+    STRICT = "strict"
+
+class ExportFormat(str, Enum):
+    """Supported playlist export formats"""
+    JSON = "json"
+    M3U = "m3u"
+
 class SongCreate(BaseModel):
     """Schema for creating a new song"""
     title: str = Field(..., min_length=1, max_length=200)
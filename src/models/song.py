@@ -1,6 +1,7 @@
-import uuid
+import os
+import sys
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 
 class Song:
     """
@@ -10,8 +11,25 @@ class Song:
     Space Complexity: O(1) per song object
     """
     
+    # No per-instance __dict__: songs are created in bulk and their fields are
+    # read in every sort, search and dedup loop, so each field is a slot that
+    # loads directly. Every slot is initialised in __init__ and changed
+    # afterwards only through the update_* mutators (and increment_play_count
+    # and add_listen_time); the two caches are also filled on first use
+    __slots__ = (
+        'id', 'title', 'title_lower', 'title_key', 'artist', 'artist_lower',
+        'artist_key', 'duration', 'rating', 'date_added', 'listen_time',
+        'play_count', '_date_added_iso', '_dict_cache'
+    )
+    
+    # Class-wide counters bumped by the mutators below, so results cached over
+    # collections of songs can tell when they may be stale
+    duration_revision = 0  # any song's duration was updated
+    key_revision = 0  # any song's title, artist, duration or rating was updated
+    
     def __init__(self, title: str, artist: str, duration: int, rating: int = 0, song_id: Optional[str] = None):
-        self.id = song_id or str(uuid.uuid4())
+        # IDs are opaque keys: 128 random bits as hex, without building a UUID
+        self.id = song_id or os.urandom(16).hex()
         self.title = title
         self.artist = artist
         self.duration = duration  # Duration in seconds
@@ -19,6 +37,39 @@ class Song:
         self.date_added = datetime.now()
         self.listen_time = 0  # Total time listened in seconds
         self.play_count = 0
+        self._index_names()
+        # ISO form of date_added for get_info(), formatted on first use
+        self._date_added_iso: Optional[str] = None
+        self._dict_cache: Optional[dict] = None
+
+    # Fields are plain attributes so reads stay cheap. Change them through
+    # the update_* methods below, which also refresh the lowercased lookup
+    # keys and drop the cached dict
+
+    def _index_names(self):
+        """Derive the normalized title and artist keys."""
+        # Interned so songs sharing a title or artist share one string object
+        # and key comparisons short-circuit on identity
+        self.title_lower = sys.intern(self.title.lower())
+        self.title_key = sys.intern(self.title_lower.strip())
+        self.artist_lower = sys.intern(self.artist.lower())
+        self.artist_key = sys.intern(self.artist_lower.strip())
+
+    @classmethod
+    def bulk_create(cls, titles: List[str], artists: List[str], durations: List[int],
+                    ratings: List[int]) -> List['Song']:
+        """
+        Create many songs at once, drawing all IDs from a single urandom call.
+        
+        Time Complexity: O(n)
+        """
+        count = len(titles)
+        hex_ids = os.urandom(16 * count).hex()
+        return [
+            cls(titles[i], artists[i], durations[i], ratings[i],
+                song_id=hex_ids[32 * i:32 * i + 32])
+            for i in range(count)
+        ]
 
     def __repr__(self):
         return f"Song(id='{self.id}', title='{self.title}', artist='{self.artist}', duration={self.duration}, rating={self.rating})"
@@ -34,14 +85,49 @@ class Song:
     def update_rating(self, new_rating: int):
         """Update song rating ensuring it stays within valid range."""
         self.rating = max(0, min(5, new_rating))
+        self._dict_cache = None
+        Song.key_revision += 1
+
+    def update_details(self, title: Optional[str] = None, artist: Optional[str] = None,
+                       duration: Optional[int] = None):
+        """
+        Update any of title, artist and duration.
+        
+        Args:
+            title: New title, or None to keep the current one
+            artist: New artist, or None to keep the current one
+            duration: New duration in seconds, or None to keep the current one
+        """
+        if title is not None:
+            self.title = title
+        if artist is not None:
+            self.artist = artist
+        if title is not None or artist is not None:
+            self._index_names()
+        if duration is not None:
+            self.duration = duration
+            Song.duration_revision += 1
+        self._dict_cache = None
+        Song.key_revision += 1
 
     def increment_play_count(self):
         """Increment the play count for analytics."""
         self.play_count += 1
+        self._dict_cache = None
     
     def add_listen_time(self, seconds: int):
         """Add to the total listen time."""
         self.listen_time += seconds
+        self._dict_cache = None
+
+    def update_play_stats(self, play_count: Optional[int] = None,
+                          listen_time: Optional[int] = None):
+        """Replace the play count and/or total listen time."""
+        if play_count is not None:
+            self.play_count = play_count
+        if listen_time is not None:
+            self.listen_time = listen_time
+        self._dict_cache = None
 
     def get_info(self) -> dict:
         """Get comprehensive song information."""
@@ -51,11 +137,24 @@ class Song:
             'artist': self.artist,
             'duration': self.duration,
             'rating': self.rating,
-            'date_added': self.date_added.isoformat(),
+            'date_added': self._get_date_added_iso(),
             'listen_time': self.listen_time,
             'play_count': self.play_count
         }
     
+    def _get_date_added_iso(self) -> str:
+        """Get date_added in ISO format, formatting it only once."""
+        if self._date_added_iso is None:
+            self._date_added_iso = self.date_added.isoformat()
+        return self._date_added_iso
+    
     def to_dict(self) -> dict:
-        """Convert song to dictionary for API responses."""
-        return self.get_info()
\ No newline at end of file
+        """
+        Convert song to dictionary for API responses.
+        
+        The dictionary is cached until the song is modified, so the same
+        object is shared between callers. Copy it before mutating.
+        """
+        if self._dict_cache is None:
+            self._dict_cache = self.get_info()
+        return self._dict_cache
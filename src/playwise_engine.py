@@ -2,6 +2,9 @@
 Main PlayWise Engine class that integrates all components
 """
 
+import json
+from collections import OrderedDict
+from itertools import chain
 from typing import Dict, List, Optional, Any
 from core.playlist_engine import PlaylistEngine
 from core.playback_history import PlaybackHistory
@@ -30,6 +33,23 @@ class PlayWiseEngine:
         self.auto_cleaner = AutoCleaner()
         self.favorites_queue = FavoritesQueue()
         
+        # Sort criteria -> bound sorter method, used by sort_playlist
+        sorter = self.playlist_sorter
+        self._sort_methods = {
+            "title": sorter.sort_by_title,
+            "artist": sorter.sort_by_artist,
+            "duration": sorter.sort_by_duration,
+            "rating": sorter.sort_by_rating,
+            "date_added": sorter.sort_by_date_added,
+            "play_count": sorter.sort_by_play_count,
+        }
+        
+        # Recent search_songs results, least recently used first. Keys include
+        # the lookup revision, so entries from before a library change are
+        # never hit again and age out
+        self._search_cache: OrderedDict[tuple, List[Song]] = OrderedDict()
+        self.search_cache_size = 512
+        
         # Initialize system snapshot with all components
         self.system_snapshot = SystemSnapshot(
             playlist_engine=self.playlist_engine,
@@ -77,6 +97,8 @@ class PlayWiseEngine:
         if not song:
             return False
         
+        if position == -1:
+            return self.playlist_engine.append_song(song, playlist_id)
         return self.playlist_engine.add_song(song, position, playlist_id)
     
     def play_song(self, song_id: str, listen_duration: Optional[int] = None) -> bool:
@@ -104,6 +126,9 @@ class PlayWiseEngine:
         # Add/update in favorites queue
         self.favorites_queue.add_song(song)
         
+        # Play count and listen time changed
+        self._song_changed(song_id)
+        
         return True
     
     def rate_song(self, song_id: str, rating: int) -> bool:
@@ -121,19 +146,60 @@ class PlayWiseEngine:
         if not song:
             return False
         
-        # Update song rating
-        old_rating = song.rating
+        rating = max(0, min(5, rating))
+        if song.rating == rating:
+            return True  # Unchanged, nothing to reindex
+        
+        # Rating is not a lookup key, so only the rating tree needs updating
         song.update_rating(rating)
+        self.song_rating_tree.delete_song(song_id)
+        self.song_rating_tree.insert_song(song)
+        self._song_changed(song_id)
+        
+        return True
+    
+    def update_song(self, song_id: str, updates: Dict[str, Any]) -> Optional[Song]:
+        """
+        Apply a partial update to a song, reindexing only what changed.
+        
+        Args:
+            song_id: ID of song to update
+            updates: New values for any of title, artist, duration and rating
+            
+        Returns:
+            Song: Updated song or None if not found
+        """
+        song = self.song_lookup.get_song(song_id)
+        if not song:
+            return None
+        
+        dirty = {
+            field for field in ('title', 'artist', 'duration', 'rating')
+            if updates.get(field) is not None and updates[field] != getattr(song, field)
+        }
         
-        # Update song lookup (handles key changes)
-        self.song_lookup.update_song(song)
+        # Title and artist are lookup keys, so unindex under the old values first
+        rekey_lookup = bool(dirty & {'title', 'artist'})
+        if rekey_lookup:
+            self.song_lookup.remove_song(song)
         
-        # Update rating tree (remove old, add new)
-        if old_rating != rating:
+        details = {field: updates[field] for field in ('title', 'artist', 'duration')
+                   if field in dirty}
+        if details:
+            song.update_details(**details)
+        
+        if rekey_lookup:
+            self.song_lookup.add_song(song)
+        
+        if 'rating' in dirty:
+            song.update_rating(updates['rating'])
             self.song_rating_tree.delete_song(song_id)
             self.song_rating_tree.insert_song(song)
         
-        return True
+        if dirty:
+            self._song_changed(song_id)
+        
+        return song
     
     def search_songs(self, query: str, search_type: str = "all") -> List[Song]:
         """
@@ -146,17 +212,29 @@ class PlayWiseEngine:
         Returns:
             List[Song]: Matching songs
         """
-        if search_type == "title":
-            return self.song_lookup.fuzzy_search_title(query)
-        elif search_type == "artist":
-            return self.song_lookup.fuzzy_search_artist(query)
-        else:  # "all"
-            title_results = self.song_lookup.fuzzy_search_title(query)
-            artist_results = self.song_lookup.fuzzy_search_artist(query)
+        cache_key = (query, search_type, self.song_lookup.revision)
+        search_cache = self._search_cache
+        results = search_cache.get(cache_key)
+        
+        if results is not None:
+            search_cache.move_to_end(cache_key)
+        else:
+            if search_type == "title":
+                results = self.song_lookup.fuzzy_search_title(query)
+            elif search_type == "artist":
+                results = self.song_lookup.fuzzy_search_artist(query)
+            else:  # "all"
+                title_results = self.song_lookup.fuzzy_search_title(query)
+                artist_results = self.song_lookup.fuzzy_search_artist(query)
+                
+                # Combine results and remove duplicates, title matches first
+                results = list(dict.fromkeys(chain(title_results, artist_results)))
             
-            # Combine results and remove duplicates
-            all_results = title_results + artist_results
-            return list(set(all_results))
+            search_cache[cache_key] = results
+            if len(search_cache) > self.search_cache_size:
+                search_cache.popitem(last=False)
+        
+        return list(results)
     
     def get_songs_by_rating(self, min_rating: int = 0, max_rating: int = 5) -> List[Song]:
         """Get songs within a rating range."""
@@ -180,26 +258,14 @@ class PlayWiseEngine:
         if not songs:
             return False
         
-        # Sort songs using the playlist sorter
-        if criteria == "title":
-            sorted_songs = self.playlist_sorter.sort_by_title(songs, reverse, algorithm)
-        elif criteria == "artist":
-            sorted_songs = self.playlist_sorter.sort_by_artist(songs, reverse, algorithm)
-        elif criteria == "duration":
-            sorted_songs = self.playlist_sorter.sort_by_duration(songs, reverse, algorithm)
-        elif criteria == "rating":
-            sorted_songs = self.playlist_sorter.sort_by_rating(songs, reverse, algorithm)
-        elif criteria == "date_added":
-            sorted_songs = self.playlist_sorter.sort_by_date_added(songs, reverse, algorithm)
-        elif criteria == "play_count":
-            sorted_songs = self.playlist_sorter.sort_by_play_count(songs, reverse, algorithm)
-        else:
+        sort_method = self._sort_methods.get(criteria)
+        if sort_method is None:
             return False
         
-        # Clear and rebuild the playlist with sorted songs
-        self.playlist_engine.clear_playlist(playlist_id)
-        for song in sorted_songs:
-            self.playlist_engine.add_song(song, -1, playlist_id)
+        sorted_songs = sort_method(songs, reverse, algorithm)
+        
+        # Replace the playlist's songs with the sorted order in one update
+        self.playlist_engine.replace_songs(sorted_songs, playlist_id)
         
         return True
     
@@ -218,6 +284,7 @@ class PlayWiseEngine:
         songs = self.playlist_engine.get_songs(playlist_id)
         if not songs:
             return {"error": "No songs found"}
+        original_count = len(songs)  # songs is the live list replaced below
         
         # Set duplicate strategy
         self.auto_cleaner.set_duplicate_strategy(strategy)
@@ -229,14 +296,12 @@ class PlayWiseEngine:
         cleaned_songs = self.auto_cleaner.clean_playlist_duplicates(songs)
         
         # Update playlist with cleaned songs
-        self.playlist_engine.clear_playlist(playlist_id)
-        for song in cleaned_songs:
-            self.playlist_engine.add_song(song, -1, playlist_id)
+        self.playlist_engine.replace_songs(cleaned_songs, playlist_id)
         
         # Get statistics after cleaning
         stats_after = {
             "total_songs": len(cleaned_songs),
-            "duplicates_removed": len(songs) - len(cleaned_songs)
+            "duplicates_removed": original_count - len(cleaned_songs)
         }
         
         return {
@@ -255,33 +320,18 @@ class PlayWiseEngine:
         Returns:
             List[Song]: Recommended songs
         """
-        recommendations = []
-        
-        # Get top favorites
-        top_favorites = self.favorites_queue.get_top_songs(limit // 2)
-        favorite_songs = [fav['song'] for fav in top_favorites]
-        
-        # Get top rated songs not in favorites
+        # Favorites first, then top rated songs, both as Song objects
+        favorite_songs = self.favorites_queue.get_top_favorite_songs(limit // 2)
         top_rated = self.song_rating_tree.get_top_rated_songs(limit)
         
-        # Combine and deduplicate
-        combined = favorite_songs + [song.to_dict() for song in top_rated]
+        recommendations = []
         seen_ids = set()
-        
-        for song_data in combined:
-            if isinstance(song_data, dict):
-                song_id = song_data['id']
-            else:
-                song_id = song_data.id
-                
-            if song_id not in seen_ids and len(recommendations) < limit:
-                if isinstance(song_data, dict):
-                    song = self.song_lookup.get_song(song_id)
-                    if song:
-                        recommendations.append(song)
-                else:
-                    recommendations.append(song_data)
-                seen_ids.add(song_id)
+        for song in chain(favorite_songs, top_rated):
+            if len(recommendations) >= limit:
+                break
+            if song.id not in seen_ids:
+                seen_ids.add(song.id)
+                recommendations.append(song)
         
         return recommendations
     
@@ -289,36 +339,54 @@ class PlayWiseEngine:
         """Get comprehensive dashboard data."""
         return self.system_snapshot.generate_snapshot()
     
+    def get_dashboard_json(self) -> str:
+        """Get dashboard data already encoded as JSON."""
+        return self.system_snapshot.generate_snapshot_json()
+    
     def undo_last_play(self) -> Optional[Song]:
         """Undo the last played song."""
         return self.playback_history.undo_last_play()
     
     def get_playlist_info(self, playlist_id: Optional[str] = None) -> Optional[Dict[str, Any]]:
         """Get detailed information about a playlist."""
-        playlist = self.playlist_engine.get_playlist(playlist_id) or self.playlist_engine.get_current_playlist()
-        if playlist:
+        playlist = self._resolve_playlist(playlist_id)
+        if playlist is not None:
             return playlist.to_dict()
         return None
     
     def export_playlist(self, playlist_id: Optional[str] = None, format: str = "json") -> Optional[str]:
         """Export a playlist in the specified format."""
-        playlist_data = self.get_playlist_info(playlist_id)
-        if not playlist_data:
+        playlist = self._resolve_playlist(playlist_id)
+        if playlist is None:
             return None
         
         if format == "json":
-            import json
-            return json.dumps(playlist_data, indent=2, default=str)
+            return json.dumps(playlist.to_dict(), indent=2, default=str)
         elif format == "m3u":
-            # Simple M3U format
-            m3u_content = "#EXTM3U\n"
-            for song in playlist_data['songs']:
-                m3u_content += f"#EXTINF:{song['duration']},{song['artist']} - {song['title']}\n"
-                m3u_content += f"# Song ID: {song['id']}\n"  # Placeholder for file path
-            return m3u_content
+            # Simple M3U format; song IDs are placeholders for file paths.
+            # Reads Song attributes directly rather than serializing each song
+            parts = ["#EXTM3U"]
+            parts.extend(
+                f"#EXTINF:{song.duration},{song.artist} - {song.title}\n# Song ID: {song.id}"
+                for song in playlist.songs
+            )
+            return "\n".join(parts) + "\n"
         
         return None
     
+    def _song_changed(self, song_id: str) -> None:
+        """Tell every component holding a song that its fields changed."""
+        self.song_lookup.mark_song_changed(song_id)
+        self.playback_history.mark_song_changed(song_id)
+        self.song_rating_tree.mark_song_changed(song_id)
+        self.favorites_queue.mark_song_changed(song_id)
+    
+    def _resolve_playlist(self, playlist_id: Optional[str]) -> Optional[Playlist]:
+        """Look up a playlist by ID, falling back to the current playlist."""
+        if playlist_id:
+            return self.playlist_engine.get_playlist(playlist_id)
+        return self.playlist_engine.get_current_playlist()
+    
     def get_engine_stats(self) -> Dict[str, Any]:
         """Get comprehensive engine statistics."""
         return {
@@ -327,7 +395,7 @@ class PlayWiseEngine:
             "total_songs": self.song_lookup.get_song_count(),
             "total_playlists": len(self.playlist_engine.playlists),
             "playback_history_size": self.playback_history.get_history_size(),
-            "favorites_count": len(self.favorites_queue.heap),
+            "favorites_count": self.favorites_queue.get_size(),
             "rating_distribution": self.song_rating_tree.get_rating_distribution(),
             "component_status": {
                 "playlist_engine": bool(self.playlist_engine),
@@ -10,13 +10,42 @@ def calculate_average_rating(ratings):
         return 0
     return sum(ratings) / len(ratings)
 
+def duplicate_key(song):
+    """
+    Case-insensitive (title, artist) key identifying duplicate songs.
+    
+    Reads the lowercased forms cached on Song, so `song` must be a Song.
+    """
+    return (song.title_lower, song.artist_lower)
+
 def is_duplicate(song, song_list):
     """Check if a song is a duplicate in the given song list."""
     return any(existing_song.title.lower() == song.title.lower() and existing_song.artist.lower() == song.artist.lower() for existing_song in song_list)
 
+def is_registered_duplicate(song, seen):
+    """
+    Check if a song is a duplicate of one added to `seen` with register_song.
+    
+    A set-based alternative to is_duplicate for checking many songs: each
+    check is O(1) instead of a scan of the song list.
+    """
+    return duplicate_key(song) in seen
+
+def register_song(song, seen):
+    """Record a song in the `seen` set used by is_registered_duplicate."""
+    seen.add(duplicate_key(song))
+
 def generate_unique_id(existing_ids):
-    """Generate a unique ID not present in the existing IDs."""
+    """
+    Generate a unique ID not present in the existing IDs.
+    
+    Returns the smallest positive integer missing from `existing_ids`. Pass a
+    set (or dict) so each probe is a hash lookup; any other iterable is
+    copied into a set first, keeping the whole call O(n).
+    """
+    if not isinstance(existing_ids, (set, frozenset, dict)):
+        existing_ids = set(existing_ids)
     new_id = 1
     while new_id in existing_ids:
         new_id += 1
-    return new_id
\ No newline at end of file
+    return new_id
@@ -1,5 +1,6 @@
 import unittest
 from src.core.auto_cleaner import AutoCleaner
+from src.models.song import Song
 
 class TestAutoCleaner(unittest.TestCase):
 
@@ -25,5 +26,40 @@ class TestAutoCleaner(unittest.TestCase):
         self.assertEqual(len(duplicates), 1)
         self.assertEqual(duplicates[0], {"title": "Song A", "artist": "Artist 1"})
 
+    def test_clean_playlist_duplicates_keeps_best_version(self):
+        low = Song("Song A", "Artist 1", 180, rating=2)
+        high = Song("song a", "Artist 1", 180, rating=4)
+        tied = Song("Song A", "artist 1", 180, rating=4)
+        other = Song("Song B", "Artist 2", 200, rating=1)
+        songs = [low, other, high, tied]
+        self.assertEqual(self.auto_cleaner.clean_playlist_duplicates(songs), [high, other])
+        self.assertEqual(
+            self.auto_cleaner.clean_playlist_duplicates(songs, keep_highest_rated=False),
+            [low, other]
+        )
+
+    def test_add_streaming_uses_sliding_window(self):
+        cleaner = AutoCleaner(streaming_window=2)
+        song_a = Song("Song A", "Artist 1", 180)
+        song_b = Song("Song B", "Artist 1", 180)
+        song_c = Song("Song C", "Artist 1", 180)
+        self.assertFalse(cleaner.add_streaming(song_a))
+        self.assertFalse(cleaner.add_streaming(song_b))
+        self.assertTrue(cleaner.add_streaming(Song("song a", "artist 1", 200)))
+        # Song B is now the oldest key and falls out of the window
+        self.assertFalse(cleaner.add_streaming(song_c))
+        self.assertFalse(cleaner.add_streaming(song_b))
+        self.assertEqual(len(cleaner.seen_keys), 2)
+
+    def test_get_duplicate_stats_skips_memoizing_large_lists(self):
+        songs = [Song("Song A", "Artist 1", 180), Song("song a", "artist 1", 200),
+                 Song("Song B", "Artist 2", 180)]
+        self.auto_cleaner.stats_cache_max_songs = 2
+        stats = self.auto_cleaner.get_duplicate_stats(songs)
+        self.assertEqual(stats['duplicate_songs'], 1)
+        self.assertEqual(len(self.auto_cleaner._stats_cache), 0)
+        self.auto_cleaner.get_duplicate_stats(songs[:2])
+        self.assertEqual(len(self.auto_cleaner._stats_cache), 1)
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -1,5 +1,6 @@
 import unittest
 from src.core.favorites_queue import FavoritesQueue
+from src.models.song import Song
 
 class TestFavoritesQueue(unittest.TestCase):
 
@@ -23,6 +24,39 @@ class TestFavoritesQueue(unittest.TestCase):
         self.assertEqual(top_songs[0]['title'], "Song D")
         self.assertEqual(top_songs[1]['title'], "Song C")
 
+    def test_get_top_favorite_songs(self):
+        song_a = Song("Song A", "Artist", 180)
+        song_b = Song("Song B", "Artist", 200)
+        self.favorites_queue.add_song(song_a, listen_time=100)
+        self.favorites_queue.add_song(song_b, listen_time=300)
+        self.assertEqual(self.favorites_queue.get_top_favorite_songs(2), [song_b, song_a])
+        self.assertEqual(self.favorites_queue.get_top_favorite_songs(0), [])
+
+    def test_update_listen_time_skips_stale_entries(self):
+        song_a = Song("Song A", "Artist", 180)
+        song_b = Song("Song B", "Artist", 200)
+        self.favorites_queue.add_song(song_a, listen_time=100)
+        self.favorites_queue.add_song(song_b, listen_time=50)
+        self.favorites_queue.update_listen_time(song_b.id, 300)
+        self.favorites_queue.update_listen_time(song_a.id, 20)
+        top_songs = self.favorites_queue.get_top_songs(5)
+        self.assertEqual([s['song']['id'] for s in top_songs], [song_b.id, song_a.id])
+        self.assertEqual(self.favorites_queue.get_size(), 2)
+        self.assertEqual(self.favorites_queue.get_song_position(song_a.id), 2)
+        self.assertEqual(self.favorites_queue.get_queue_stats()['total_listen_time'], 320)
+
+    def test_bulk_update_keeps_top_songs(self):
+        queue = FavoritesQueue(max_size=2)
+        songs = [Song(f"Song {i}", "Artist", 180) for i in range(4)]
+        queue.add_song(songs[0], listen_time=50)
+        updated = queue.bulk_update_from_playback_history([
+            (songs[1], 10), (songs[2], 80), (songs[3], 30), (songs[0], 5)
+        ])
+        self.assertEqual(updated, 2)
+        top_songs = queue.get_top_songs(5)
+        self.assertEqual([s['song']['id'] for s in top_songs], [songs[2].id, songs[3].id])
+        self.assertEqual(queue.get_song_position(songs[3].id), 2)
+
     def test_empty_queue(self):
         top_songs = self.favorites_queue.get_top_songs(5)
         self.assertEqual(top_songs, [])
@@ -1,5 +1,6 @@
 import unittest
 from src.core.playback_history import PlaybackHistory
+from src.models.song import Song
 
 class TestPlaybackHistory(unittest.TestCase):
 
@@ -22,6 +23,18 @@ class TestPlaybackHistory(unittest.TestCase):
             self.history.add_to_history(f"Song {i}")
         self.assertEqual(self.history.get_recent_history(5), ["Song 6", "Song 5", "Song 4", "Song 3", "Song 2"])
 
+    def test_most_played_tracks_evictions(self):
+        song_a = Song("Song A", "Artist", 180)
+        song_b = Song("Song B", "Artist", 200)
+        self.history.add_to_history(song_a)
+        for _ in range(5):
+            self.history.add_to_history(song_b)
+        # song_a has been evicted from the 5-entry history
+        self.assertEqual(self.history.get_most_played_songs(5), [song_b])
+        self.history.undo_last_play()
+        self.history.add_to_history(song_a)
+        self.assertEqual(self.history.get_most_played_songs(5), [song_b, song_a])
+
     def test_empty_history(self):
         self.assertEqual(self.history.get_recent_history(1), [])
 
@@ -31,5 +31,40 @@ class TestPlaylistEngine(unittest.TestCase):
         self.playlist_engine.reverse_playlist()
         self.assertEqual(self.playlist_engine.songs[0], self.song2)
 
+    def test_find_song_by_id_after_reordering(self):
+        playlist_id = self.playlist_engine.create_playlist("Mix")
+        for song in (self.song1, self.song2, self.song3):
+            self.playlist_engine.append_song(song, playlist_id)
+        self.assertEqual(self.playlist_engine.find_song_by_id(self.song3.id, playlist_id), 2)
+        self.playlist_engine.move_song(2, 0, playlist_id)
+        self.assertEqual(self.playlist_engine.find_song_by_id(self.song3.id, playlist_id), 0)
+        self.playlist_engine.delete_song(0, playlist_id)
+        self.assertIsNone(self.playlist_engine.find_song_by_id(self.song3.id, playlist_id))
+        self.assertEqual(self.playlist_engine.find_song_by_id(self.song2.id, playlist_id), 1)
+
+    def test_find_song_by_id_misses_and_appends_keep_index(self):
+        playlist_id = self.playlist_engine.create_playlist("Mix")
+        self.playlist_engine.append_song(self.song1, playlist_id)
+        self.assertEqual(self.playlist_engine.find_song_by_id(self.song1.id, playlist_id), 0)
+        playlist = self.playlist_engine.get_playlist(playlist_id)
+        index = playlist._index_cache
+        self.assertIsNone(self.playlist_engine.find_song_by_id("missing", playlist_id))
+        self.playlist_engine.append_song(self.song2, playlist_id)
+        self.assertEqual(self.playlist_engine.find_song_by_id(self.song2.id, playlist_id), 1)
+        self.assertIs(playlist._index_cache, index)
+        self.playlist_engine.add_song(self.song3, 0, playlist_id)
+        self.assertEqual(self.playlist_engine.find_song_by_id(self.song2.id, playlist_id), 2)
+
+    def test_replace_songs(self):
+        playlist_id = self.playlist_engine.create_playlist("Mix")
+        self.playlist_engine.append_song(self.song1, playlist_id)
+        songs = self.playlist_engine.get_songs(playlist_id)
+        self.assertEqual(self.playlist_engine.get_total_duration(playlist_id), 210)
+        self.assertTrue(self.playlist_engine.replace_songs([self.song3, self.song2], playlist_id))
+        self.assertEqual(songs, [self.song3, self.song2])
+        self.assertEqual(self.playlist_engine.get_total_duration(playlist_id), 420)
+        self.assertEqual(self.playlist_engine.find_song_by_id(self.song2.id, playlist_id), 1)
+        self.assertFalse(self.playlist_engine.replace_songs([], "missing"))
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
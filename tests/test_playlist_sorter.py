@@ -1,5 +1,6 @@
 import unittest
 from src.core.playlist_sorter import PlaylistSorter
+from src.models.song import Song
 
 class TestPlaylistSorter(unittest.TestCase):
 
@@ -39,5 +40,14 @@ class TestPlaylistSorter(unittest.TestCase):
         self.assertEqual(sorted_songs[1]["title"], "Song C")
         self.assertEqual(sorted_songs[2]["title"], "Song B")
 
+    def test_sort_by_multiple_criteria_reverse_string(self):
+        song_a = Song("Song A", "Artist", 180, 4)
+        song_b = Song("Song B", "Artist", 200, 4)
+        song_c = Song("Song C", "Artist", 210, 5)
+        sorted_songs = self.sorter.sort_by_multiple_criteria(
+            [song_a, song_c, song_b], [('rating', True), ('title', True)]
+        )
+        self.assertEqual(sorted_songs, [song_c, song_b, song_a])
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -32,8 +32,31 @@ class TestSongLookup(unittest.TestCase):
         self.song_lookup.add_song(self.song1)
         self.assertEqual(len(self.song_lookup.songs), 3)  # Should not increase
 
+    def test_get_all_songs_pagination(self):
+        self.assertEqual(self.song_lookup.get_all_songs(), [self.song1, self.song2, self.song3])
+        self.assertEqual(self.song_lookup.get_all_songs(1, 1), [self.song2])
+        self.assertEqual(self.song_lookup.get_all_songs(2, 10), [self.song3])
+        self.assertEqual(self.song_lookup.get_all_songs(5, 10), [])
+
     def tearDown(self):
         self.song_lookup.clear()  # Assuming there's a method to clear the lookup
 
+    def test_fuzzy_search_title_tracks_changes(self):
+        self.assertEqual(self.song_lookup.fuzzy_search_title("title 2"), [self.song2])
+        self.assertEqual(len(self.song_lookup.fuzzy_search_title("le ")), 3)
+        self.assertEqual(self.song_lookup.fuzzy_search_title("e 3"), [self.song3])
+        self.song_lookup.remove_song(self.song3)
+        self.assertEqual(self.song_lookup.fuzzy_search_title("e 3"), [])
+        song4 = Song("Another Title", "Artist 4", 200)
+        self.song_lookup.add_song(song4)
+        self.assertEqual(self.song_lookup.fuzzy_search_title("other"), [song4])
+        self.assertEqual(self.song_lookup.fuzzy_search_artist("ist 4"), [song4])
+
+    def test_search_by_partial_info_both_queries(self):
+        results = self.song_lookup.search_by_partial_info("title", "artist 1")
+        self.assertEqual(set(results), {self.song1, self.song3})
+        self.assertEqual(self.song_lookup.search_by_partial_info("e 2", "artist 1"), [])
+        self.assertEqual(self.song_lookup.search_by_partial_info("E 3", "Ist 1"), [self.song3])
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -34,5 +34,16 @@ class TestSongRatingTree(unittest.TestCase):
         result = self.rating_tree.get_songs_by_rating_range(3, 5)
         self.assertEqual(set(result), {song1, song2})
 
+    def test_delete_song_by_id(self):
+        song1 = Song("Song A", "Artist A", 200, 4)
+        song2 = Song("Song B", "Artist B", 240, 4)
+        self.rating_tree.insert_song(song1)
+        self.rating_tree.insert_song(song2)
+        self.assertFalse(self.rating_tree.insert_song(song1))
+        self.assertTrue(self.rating_tree.delete_song(song1.id))
+        self.assertFalse(self.rating_tree.delete_song(song1.id))
+        self.assertEqual(self.rating_tree.search_by_rating(4), [song2])
+        self.assertEqual(self.rating_tree.get_song_count(), 1)
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -1,10 +1,16 @@
+import json
 import unittest
 from src.core.system_snapshot import SystemSnapshot
+from src.core.song_lookup import SongLookup
+from src.models.song import Song
 
 class TestSystemSnapshot(unittest.TestCase):
 
-    def setUp(self):
-        self.snapshot = SystemSnapshot()
+    @classmethod
+    def setUpClass(cls):
+        # Shared by the read-only shape tests; tests that mutate state build
+        # their own snapshot
+        cls.snapshot = SystemSnapshot()
 
     def test_generate_snapshot(self):
         # Assuming the SystemSnapshot class has a method to generate a snapshot
@@ -38,5 +44,69 @@ class TestSystemSnapshot(unittest.TestCase):
         self.assertIn('total_playlists', statistics)  # Check for expected keys
         self.assertIn('total_songs', statistics)
 
+    def test_song_analytics_duration_buckets(self):
+        song_lookup = SongLookup()
+        for duration in [60, 119, 120, 240, 359, 360, 600]:
+            song_lookup.add_song(Song(f"Song {duration}", "Artist", duration))
+        snapshot = SystemSnapshot(song_lookup=song_lookup)
+        analytics = snapshot._get_song_analytics()
+        self.assertEqual(analytics['duration_distribution'], {
+            '0-2min': 2, '2-3min': 1, '3-4min': 0,
+            '4-5min': 1, '5-6min': 1, '6min+': 2
+        })
+        self.assertEqual([song['duration'] for song in analytics['top_longest_songs']],
+                         [600, 360, 359, 240, 120])
+        self.assertEqual([song['duration'] for song in analytics['top_shortest_songs']],
+                         [359, 240, 120, 119, 60])
+
+    def test_snapshot_sections_recomputed_only_when_inputs_change(self):
+        song_lookup = SongLookup()
+        song = Song("First", "Artist", 200)
+        song_lookup.add_song(song)
+        snapshot = SystemSnapshot(song_lookup=song_lookup)
+        snapshot.generate_snapshot()
+        misses = snapshot.section_cache_misses
+        snapshot.generate_snapshot()
+        self.assertEqual(snapshot.section_cache_misses, misses)
+        song.increment_play_count()
+        song_lookup.mark_song_changed(song.id)
+        changed = snapshot.generate_snapshot()
+        self.assertEqual(snapshot.section_cache_misses, misses + 2)
+        self.assertEqual(changed['song_analytics']['top_longest_songs'][0]['play_count'], 1)
+        song_lookup.add_song(Song("Second", "Artist", 300))
+        added = snapshot.generate_snapshot()
+        self.assertEqual(added['song_analytics']['total_songs'], 2)
+
+    def test_snapshot_result_is_a_copy(self):
+        song_lookup = SongLookup()
+        song_lookup.add_song(Song("First", "Artist", 200))
+        snapshot = SystemSnapshot(song_lookup=song_lookup)
+        first = snapshot.generate_snapshot()
+        first['song_analytics']['top_longest_songs'][0]['title'] = "Changed"
+        second = snapshot.generate_snapshot()
+        self.assertEqual(second['song_analytics']['top_longest_songs'][0]['title'], "First")
+
+    def test_snapshot_reports_section_cache_hits(self):
+        snapshot = SystemSnapshot(song_lookup=SongLookup())
+        first = snapshot.generate_snapshot()
+        self.assertEqual(first['system_health']['cache_status']['section_hits'], 0)
+        second = snapshot.generate_snapshot()
+        cache_status = second['system_health']['cache_status']
+        self.assertEqual(cache_status['section_hits'], 5)
+        self.assertEqual(cache_status['section_misses'], 5)
+
+    def test_snapshot_json_matches_snapshot(self):
+        song_lookup = SongLookup()
+        song_lookup.add_song(Song("First", "Artist", 200))
+        snapshot = SystemSnapshot(song_lookup=song_lookup)
+        first = json.loads(snapshot.generate_snapshot_json())
+        self.assertEqual(first['song_analytics']['total_songs'], 1)
+        song_lookup.add_song(Song("Second", "Artist", 300))
+        second = json.loads(snapshot.generate_snapshot_json())
+        expected = snapshot.generate_snapshot()
+        self.assertEqual(list(second), list(expected))
+        self.assertEqual(second['song_analytics'],
+                         json.loads(json.dumps(expected['song_analytics'])))
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file